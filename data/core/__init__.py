@@ -1,13 +1,30 @@
 from .solver import LiquidSolver
 from .lm_solver import LMSolver
+from .mixture import MixtureSolver
 from .thermodynamics import calculate_thermodynamics, calculate_all_thermodynamics
+from .transforms import set_backend, radial_transform, inverse_radial_transform
 from .file_io import load_bridg, save_results
+from .result_store import ResultStore
+from .reentrant import GridSpec, StateSpec, solve_state, solve_states
+from .analytic import py_hard_sphere, solve_hard_sphere_py, reference_initial_guess
 
 __all__ = [
     'LiquidSolver',
     'LMSolver',
+    'MixtureSolver',
     'calculate_thermodynamics',
     'calculate_all_thermodynamics',
+    'set_backend',
+    'radial_transform',
+    'inverse_radial_transform',
     'load_bridg',
-    'save_results'
+    'save_results',
+    'ResultStore',
+    'GridSpec',
+    'StateSpec',
+    'solve_state',
+    'solve_states',
+    'py_hard_sphere',
+    'solve_hard_sphere_py',
+    'reference_initial_guess'
 ]
\ No newline at end of file
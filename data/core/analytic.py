@@ -0,0 +1,130 @@
+import numpy as np
+from .constants import ClosureType
+from .transforms import radial_grid, inverse_radial_transform
+
+
+def _py_coefficients(eta):
+    """Коэффициенты c(r) = -a - b x - d x^3 (x = r/sigma) решения Вертгейма-Тиле"""
+    a = (1 + 2 * eta) ** 2 / (1 - eta) ** 4
+    b = -6 * eta * (1 + eta / 2) ** 2 / (1 - eta) ** 4
+    d = eta * a / 2
+    return a, b, d
+
+
+def packing_fraction(density, sigma=1.0):
+    return np.pi * density * sigma ** 3 / 6
+
+
+def py_hard_sphere_c(r, density, sigma=1.0):
+    """Прямая корреляционная функция твердых сфер в приближении PY"""
+    a, b, d = _py_coefficients(packing_fraction(density, sigma))
+    x = np.asarray(r) / sigma
+    return np.where(x < 1, -a - b * x - d * x ** 3, 0.0)
+
+
+def py_hard_sphere_ck(k, density, sigma=1.0):
+    """Фурье-образ c(k) твердых сфер PY в замкнутой форме"""
+    a, b, d = _py_coefficients(packing_fraction(density, sigma))
+    q = np.asarray(k) * sigma
+    s, c = np.sin(q), np.cos(q)
+    # Интегралы I_n = int_0^1 x^n sin(qx) dx
+    i1 = (s - q * c) / q ** 2
+    i2 = (2 * q * s + (2 - q ** 2) * c - 2) / q ** 3
+    i4 = ((-q ** 4 + 12 * q ** 2 - 24) * c + (4 * q ** 3 - 24 * q) * s + 24) / q ** 5
+    return 4 * np.pi * sigma ** 3 / q * (-a * i1 - b * i2 - d * i4)
+
+
+def py_hard_sphere(density, L, Nd, sigma=1.0):
+    """Аналитическое решение PY для твердых сфер на сетке r_i = i * L / Nd.
+
+    c(k) известна точно, gamma(k) = rho c^2 / (1 - rho c) - гладкая функция r,
+    поэтому g(r) получается одним обратным преобразованием без итераций.
+    Возвращает (r, c, h, g).
+    """
+    d_R = L / Nd
+    r, k = radial_grid(Nd, d_R)[:2]
+    c_k = py_hard_sphere_ck(k, density, sigma)
+    gamma = inverse_radial_transform(density * c_k ** 2 / (1 - density * c_k), d_R)
+    c = py_hard_sphere_c(r, density, sigma)
+    h = np.where(r < sigma, -1.0, gamma + c)
+    return r, c, h, h + 1.0
+
+
+def py_hard_sphere_pressure(density, temperature=1.0, sigma=1.0, route='virial'):
+    """Давление твердых сфер PY по вириальному или сжимаемостному маршруту"""
+    eta = packing_fraction(density, sigma)
+    if route == 'virial':
+        z = (1 + 2 * eta + 3 * eta ** 2) / (1 - eta) ** 2
+    else:
+        z = (1 + eta + eta ** 2) / (1 - eta) ** 3
+    return density * temperature * z
+
+
+def py_hard_sphere_on_grid(r, density, sigma=1.0):
+    """Аналитическое решение PY на произвольной равномерной сетке решателя
+    (в том числе linspace(0, L, Nd) с точкой r = 0): возвращает (c, h, g)"""
+    r = np.asarray(r)
+    n = np.count_nonzero(r > 0)
+    r_t, c_t, h_t, g_t = py_hard_sphere(density, r[-1], n, sigma)
+    c = py_hard_sphere_c(r, density, sigma)
+    # Сетка решателя совпадает с сеткой преобразования - интерполяция точна
+    h = np.where(r < sigma, -1.0, np.interp(r, r_t, h_t))
+    return c, h, h + 1.0
+
+
+def solve_hard_sphere_py(solver):
+    """Быстрый путь для твердых сфер с замыканием PY: c(r), h(r), g(r)
+    на сетке решателя за один векторизованный шаг, без итераций"""
+    c, h, g = py_hard_sphere_on_grid(solver.R_dist, solver.Density)
+    solver.c = c
+    solver.h = h
+    solver.g = g
+    solver.g_prev = g.copy()
+
+
+def barker_henderson_diameter(temperature, n_points=2000):
+    """Эффективный диаметр твердых сфер для отталкивательной части LJ (WCA)"""
+    r_min = 2 ** (1 / 6)
+    r = np.linspace(1e-3, r_min, n_points)
+    u0 = 4 * (r ** -12 - r ** -6) + 1
+    f = 1 - np.exp(-u0 / temperature)
+    return 1e-3 + np.sum(0.5 * (f[1:] + f[:-1]) * np.diff(r))
+
+
+def reference_initial_guess(solver):
+    """Начальное приближение для LJ по системе отсчёта WCA:
+    g0(r) = exp(-u0(r)/T) * y_HS(r; d) при той же плотности"""
+    r = solver.R_dist
+    d = barker_henderson_diameter(solver.Temperature)
+    c, h_hs, g_hs = py_hard_sphere_on_grid(r, solver.Density, sigma=d)
+
+    # Функция полости y = g_HS вне ядра; внутри ядра - значение на контакте
+    contact = g_hs[np.searchsorted(r, d)]
+    y = np.where(r < d, contact, g_hs)
+
+    with np.errstate(divide='ignore', over='ignore'):
+        r_safe = np.where(r > 0, r, np.inf)
+        u0 = np.where(r < 2 ** (1 / 6), 4 * (r_safe ** -12 - r_safe ** -6) + 1, 0.0)
+        boltzmann = np.exp(-u0 / solver.Temperature)
+
+    solver.g = (boltzmann * y).astype(r.dtype)
+    solver.g[0] = 0
+    solver.h = solver.g - 1
+
+
+def reference_initial_gamma(solver):
+    """Начальное приближение gamma = h - c для MixtureSolver(1) по системе
+    отсчёта WCA, то же g0 = exp(-u0/T) * y_HS(r; d), что и reference_initial_guess.
+    Замыкание решателя даёт g = exp(-U/T) * y, поэтому y = y_HS * exp(u1/T),
+    u1 = U - u0 - притягивающая часть LJ; затем PY: gamma = y - 1, HNC: ln y"""
+    if solver.n_components != 1:
+        raise ValueError("Начальное приближение WCA определено только для одного компонента")
+    r = solver.R_dist
+    d = barker_henderson_diameter(solver.Temperature)
+    c, h, g = py_hard_sphere_on_grid(r, solver.Density, sigma=d)
+    # Для твердых сфер PY y = 1 + h - c на всей сетке, включая ядро
+    log_y = np.log(1 + h - c)
+    u1 = np.where(r < 2 ** (1 / 6), -1.0, 4 * (r ** -12 - r ** -6))
+    log_y += u1 / solver.Temperature
+    gamma = log_y if solver.closure == ClosureType.HNC else np.exp(log_y) - 1
+    solver.gamma = gamma.reshape(solver.gamma.shape).astype(solver.gamma.dtype)
@@ -0,0 +1,159 @@
+import copy
+import logging
+import numpy as np
+from .sweep import converge
+from .thermodynamics import pressure_energy_from_g
+
+logger = logging.getLogger(__name__)
+
+
+def set_grid(solver, L, Nd):
+    """Установка сетки решателя и переинициализация массивов"""
+    solver.L = L
+    solver.Nd = int(Nd)
+    solver.At = solver.L / solver.Nd
+    solver._initialize_arrays()
+
+
+def solve_on_grid(solver, L, Nd):
+    """Решение на заданной сетке на копии решателя: (r, g, pressure, energy).
+    Давление и энергия считаются по g(r) без ядра - они сходятся по L и Nd"""
+    trial = copy.copy(solver)
+    set_grid(trial, L, Nd)
+    converge(trial)
+    pressure, energy = pressure_energy_from_g(trial.R_dist, trial.g, trial.potential_type,
+                                              trial.Temperature, trial.Density)
+    return trial.R_dist, trial.g.copy(), pressure, energy
+
+
+def _difference(coarse, fine):
+    """Относительные разности g(r) (на общей части сетки вне ядра), давления и энергии.
+    Неконечные величины не учитываются. Узлы, интерполяция в которых задевает
+    ядро, исключаются: скачок g на границе ядра не сходится поточечно"""
+    r_c, g_c, p_c, u_c = coarse
+    r_f, g_f, p_f, u_f = fine
+    r_max = min(r_c[-1], r_f[-1])
+    outside_f = (g_f > 1e-8).astype(float)
+    mask = (r_c <= r_max) & (g_c > 1e-8)
+    mask[mask] = np.interp(r_c[mask], r_f, outside_f) == 1.0
+    g_on_coarse = np.interp(r_c[mask], r_f, g_f)
+    with np.errstate(invalid='ignore'):
+        diff = np.array([
+            np.max(np.abs(g_on_coarse - g_c[mask])) / (np.max(np.abs(g_c[mask])) + 1e-10),
+            abs(p_f - p_c) / max(abs(p_f), 1.0),
+            abs(u_f - u_c) / max(abs(u_f), 1.0),
+        ])
+    return np.where(np.isfinite(diff), diff, 0.0)
+
+
+def richardson_error(diffs, ratio=2.0):
+    """Оценка погрешности последнего решения по Ричардсону.
+
+    Порядок сходимости оценивается по двум последним разностям,
+    при одной разности принимается первый порядок.
+    """
+    last = diffs[-1]
+    if len(diffs) < 2:
+        order = np.ones_like(last)
+    else:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            order = np.log(diffs[-2] / last) / np.log(ratio)
+        order = np.clip(np.nan_to_num(order, nan=1.0, posinf=4.0), 0.5, 4.0)
+    return last / (ratio ** order - 1.0)
+
+
+def _stagnates(diffs):
+    """Разности между сетками не убывают - решение не сходится по сетке"""
+    return len(diffs) > 1 and np.max(diffs[-1]) > 0.9 * np.max(diffs[-2])
+
+
+def select_grid(solver, tolerance=1e-3, L0=5.0, Nd0=100, max_L=50.0, max_Nd=10000, fallback_grid=None):
+    """Автоматический выбор (L, Nd) с контролем погрешности.
+
+    Сначала L увеличивается при фиксированном шаге сетки, пока погрешность
+    обрезания не станет меньше tolerance, затем Nd удваивается до выполнения
+    оценки Ричардсона для дискретизации. Возвращает (L, Nd, оценка погрешности).
+
+    Если точность не достигнута (в том числе когда разности между сетками
+    перестают убывать), возвращается исходная сетка решателя с оценкой
+    погрешности inf (или fallback_grid = (L, Nd)), а промах записывается
+    в журнал - более дорогая сетка без гарантии точности не выбирается.
+    """
+    fallback = tuple(fallback_grid or (solver.L, solver.Nd)) + (np.full(3, np.inf),)
+
+    def miss(L, Nd, error, reason):
+        logger.warning("Сетка не подобрана (%s): L=%.3g, Nd=%d, оценка погрешности g, P, U %s "
+                       "при допуске %.1e; используется исходная сетка L=%.3g, Nd=%d",
+                       reason, L, Nd, np.array2string(np.asarray(error), precision=2),
+                       tolerance, fallback[0], fallback[1])
+        return fallback
+
+    # Погрешность обрезания по L
+    step = L0 / Nd0
+    L = L0
+    prev = solve_on_grid(solver, L, Nd0)
+    diffs = []
+    while True:
+        L_next = L * 1.5
+        if L_next > max_L or round(L_next / step) > max_Nd:
+            return miss(L, round(L / step), diffs[-1] if diffs else np.inf, "предел L")
+        cur = solve_on_grid(solver, L_next, round(L_next / step))
+        diffs.append(_difference(prev, cur))
+        if np.max(diffs[-1]) < tolerance:
+            break
+        if _stagnates(diffs):
+            return miss(L_next, round(L_next / step), diffs[-1], "нет сходимости по L")
+        L, prev = L_next, cur
+    Nd = round(L / step)
+
+    # Погрешность дискретизации по Nd
+    diffs = []
+    error = np.full(3, np.inf)
+    while Nd * 2 <= max_Nd:
+        cur = solve_on_grid(solver, L, Nd * 2)
+        diffs.append(_difference(prev, cur))
+        fine_error = richardson_error(diffs)
+        # Погрешность более грубой сетки: разность плюс остаток тонкой
+        coarse_error = diffs[-1] + fine_error
+        if np.max(coarse_error) < tolerance:
+            return L, Nd, coarse_error
+        Nd, prev, error = Nd * 2, cur, fine_error
+        if np.max(error) < tolerance:
+            return L, Nd, error
+        if _stagnates(diffs):
+            return miss(L, Nd, error, "нет сходимости по Nd")
+    return miss(L, Nd, error, "предел Nd")
+
+
+class GridCache:
+    """Кэш выбранных сеток по областям пространства состояний (T, rho).
+    Оценки погрешности выбранных сеток хранятся в errors по тем же ключам"""
+
+    def __init__(self, tolerance=1e-3, d_rho=0.1, d_T=0.25, **select_kwargs):
+        self.tolerance = tolerance
+        self.d_rho = d_rho
+        self.d_T = d_T
+        self.select_kwargs = select_kwargs
+        self.grids = {}
+        self.errors = {}
+
+    def region(self, solver):
+        return (
+            solver.potential_type,
+            solver.closure,
+            int(np.floor(solver.Temperature / self.d_T)),
+            int(np.floor(solver.Density / self.d_rho)),
+        )
+
+    def grid_for(self, solver):
+        """(L, Nd) для текущего состояния решателя; подбирается один раз на область"""
+        key = self.region(solver)
+        if key not in self.grids:
+            L, Nd, error = select_grid(solver, self.tolerance, **self.select_kwargs)
+            self.grids[key] = (L, Nd)
+            self.errors[key] = float(np.max(error))
+        return self.grids[key]
+
+    def error_for(self, solver):
+        """Оценка погрешности сетки, выбранной для области текущего состояния"""
+        return self.errors.get(self.region(solver))
@@ -0,0 +1,220 @@
+import argparse
+import time
+import numpy as np
+from .constants import *
+from .solver import LiquidSolver
+from .lm_solver import LMSolver
+from .mixture import MixtureSolver
+from .sweep import converge
+from .analytic import py_hard_sphere
+from .thermodynamics import pressure_energy_from_g
+from .file_io import save_results
+
+
+# Стандартный набор точек состояния (T, rho)
+STATE_POINTS = {
+    PotentialType.HARD_SPHERE: [(1.0, 0.3), (1.0, 0.6), (1.0, 0.8)],
+    PotentialType.LENNARD_JONES: [(2.0, 0.3), (1.5, 0.6), (1.2, 0.7)],
+}
+
+
+def _run_numerical(potential, closure, temperature, density, L, Nd, max_iterations):
+    """Численное интегрирование: LiquidSolver.make_iteration (замыкание PY),
+    без аналитического пути для твердых сфер - замеряются сами итерации"""
+    solver = LiquidSolver()
+    solver.potential_type = potential
+    solver.closure = closure
+    solver.Temperature = temperature
+    solver.Density = density
+    solver.L = L
+    solver.Nd = Nd
+    solver.At = L / Nd
+    solver.max_iterations = max_iterations
+    solver._initialize_arrays()
+    iterations, dg = converge(solver, analytic=False)
+    return solver.R_dist, solver.g, iterations, bool(dg < solver.convergence_dg)
+
+
+def _run_fourier(potential, closure, temperature, density, L, Nd, max_iterations):
+    """Фурье-преобразование: MixtureSolver с одним компонентом"""
+    solver = MixtureSolver(1)
+    solver.potential_type = potential
+    solver.closure = closure
+    solver.Temperature = temperature
+    solver.Density = density
+    solver.L = L
+    solver.Nd = Nd
+    solver.max_iterations = max_iterations
+    solver._initialize_arrays()
+    iterations = solver.solve()
+    return solver.R_dist, solver.g[0, 0], iterations, solver.converged
+
+
+def _run_lm(potential, closure, temperature, density, L, Nd, max_iterations):
+    """LM-метод поверх LiquidSolver"""
+    solver = LiquidSolver()
+    solver.potential_type = potential
+    solver.closure = closure
+    solver.Temperature = temperature
+    solver.Density = density
+    solver.L = L
+    solver.Nd = Nd
+    solver._initialize_arrays()
+    lm = LMSolver(solver)
+    lm.solve()
+    return solver.R_dist, solver.g, 1, True
+
+
+ENGINES = {
+    SolutionMethod.NUMERICAL_INTEGRATION: _run_numerical,
+    SolutionMethod.FOURIER_TRANSFORM: _run_fourier,
+    SolutionMethod.LM_METHOD: _run_lm,
+}
+
+# Замыкания, которые реализует каждый метод
+ENGINE_CLOSURES = {
+    SolutionMethod.NUMERICAL_INTEGRATION: {ClosureType.PY},
+    SolutionMethod.FOURIER_TRANSFORM: {ClosureType.PY, ClosureType.HNC},
+    # LMSolver пока не работает поверх LiquidSolver (нет полей N, FM, ...)
+    SolutionMethod.LM_METHOD: set(),
+}
+
+
+def reference_solution(potential, closure, temperature, density, L, Nd, refine=8):
+    """Эталон: аналитика PY для твердых сфер, иначе Фурье-решение на сетке в refine раз мельче"""
+    if potential == PotentialType.HARD_SPHERE and closure == ClosureType.PY:
+        r, c, h, g = py_hard_sphere(density, L, Nd * refine)
+    else:
+        r, g, iterations, converged = _run_fourier(
+            potential, closure, temperature, density, L, Nd * refine, 10000)
+        if not converged:
+            raise RuntimeError("Эталонное решение не сошлось")
+    return (r, g) + pressure_energy_from_g(r, g, potential, temperature, density)
+
+
+def _errors(result, reference):
+    """Среднеквадратичная ошибка g(r) и относительные ошибки давления и энергии"""
+    r, g, pressure, energy = result
+    r_ref, g_ref, p_ref, u_ref = reference
+    mask = (r > 0) & (r <= r_ref[-1])
+    g_error = np.sqrt(np.mean((g[mask] - np.interp(r[mask], r_ref, g_ref)) ** 2))
+    return (
+        float(g_error),
+        float(abs(pressure - p_ref) / max(abs(p_ref), 1e-10)),
+        float(abs(energy - u_ref) / max(abs(u_ref), 1.0)),
+    )
+
+
+def run_benchmark(L=10.0, Nd=500, max_iterations=1000, potentials=None,
+                  methods=None, closures=None, state_points=None):
+    """Прогон всех методов и замыканий по стандартным точкам состояния.
+
+    Для каждой комбинации фиксируются время, число итераций и ошибки
+    относительно эталона. Давление и энергия всех методов считаются одной
+    формулой по g(r) (pressure_energy_from_g), поэтому ошибки сравнивают
+    точность, а не разные формулы. Неподдерживаемые комбинации, сбои,
+    несошедшиеся и неконечные решения попадают в отчёт со статусом,
+    а не прерывают прогон.
+    """
+    potentials = potentials or list(PotentialType)
+    methods = methods or list(SolutionMethod)
+    closures = closures or list(ClosureType)
+    records = []
+
+    # Прогрев: компиляция numba и кэш сеток не должны попадать в замеры
+    for potential in potentials:
+        for method in methods:
+            try:
+                ENGINES[method](potential, ClosureType.PY, 1.0, 0.1, L, Nd, 2)
+            except Exception:
+                pass
+
+    for potential in potentials:
+        for temperature, density in (state_points or STATE_POINTS[potential]):
+            for closure in closures:
+                reference = None
+                if any(closure in ENGINE_CLOSURES[method] for method in methods):
+                    try:
+                        reference = reference_solution(potential, closure, temperature, density, L, Nd)
+                    except Exception:
+                        pass
+
+                for method in methods:
+                    record = {
+                        'method': method.name,
+                        'closure': closure.name,
+                        'potential': potential.name,
+                        'temperature': temperature,
+                        'density': density,
+                    }
+                    if closure not in ENGINE_CLOSURES[method]:
+                        record['status'] = 'unsupported'
+                        records.append(record)
+                        continue
+                    start = time.perf_counter()
+                    try:
+                        r, g, iterations, converged = ENGINES[method](
+                            potential, closure, temperature, density, L, Nd, max_iterations)
+                    except Exception as e:
+                        record['status'] = f"failed: {type(e).__name__}: {e}"
+                        records.append(record)
+                        continue
+                    record['time'] = time.perf_counter() - start
+                    record['iterations'] = int(iterations)
+                    if not np.all(np.isfinite(g)):
+                        record['status'] = 'non-finite'
+                        records.append(record)
+                        continue
+                    pressure, energy = pressure_energy_from_g(r, g, potential, temperature, density)
+                    record['pressure'] = pressure
+                    record['energy'] = energy
+                    record['status'] = 'ok' if converged else 'not converged'
+                    if reference is not None:
+                        errors = _errors((r, g, pressure, energy), reference)
+                        record['g_error'], record['pressure_error'], record['energy_error'] = errors
+                    records.append(record)
+    return records
+
+
+def format_table(records):
+    """Текстовая таблица: ошибка против времени и итераций"""
+    header = (f"{'method':<22}{'closure':<8}{'pot':<15}{'T':>5}{'ρ':>6}"
+              f"{'iter':>7}{'time, s':>10}{'Δg rms':>11}{'ΔP/P':>11}{'ΔU/U':>11}  status")
+    lines = [header, '-' * len(header)]
+    for rec in records:
+        def num(key, fmt):
+            return format(rec[key], fmt) if key in rec else '-'
+        lines.append(
+            f"{rec['method']:<22}{rec['closure']:<8}{rec['potential']:<15}"
+            f"{rec['temperature']:>5.2f}{rec['density']:>6.2f}"
+            f"{num('iterations', 'd'):>7}{num('time', '.4f'):>10}"
+            f"{num('g_error', '.2e'):>11}{num('pressure_error', '.2e'):>11}"
+            f"{num('energy_error', '.2e'):>11}  {rec['status']}"
+        )
+    return '\n'.join(lines)
+
+
+def finite_records(records):
+    """Копия записей с неконечными числами, заменёнными на None (валидный JSON)"""
+    def clean(value):
+        if isinstance(value, float) and not np.isfinite(value):
+            return None
+        return value
+    return [{key: clean(value) for key, value in rec.items()} for rec in records]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сравнение методов решения: точность против времени")
+    parser.add_argument('--L', type=float, default=10.0)
+    parser.add_argument('--Nd', type=int, default=500)
+    parser.add_argument('--max-iterations', type=int, default=1000)
+    parser.add_argument('--output', default='benchmark.json')
+    args = parser.parse_args()
+
+    records = run_benchmark(args.L, args.Nd, args.max_iterations)
+    print(format_table(records))
+    save_results(finite_records(records), args.output)
+
+
+if __name__ == "__main__":
+    main()
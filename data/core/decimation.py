@@ -0,0 +1,86 @@
+import numpy as np
+from numba import njit
+
+
+@njit
+def minmax_decimate(x, y, x_min, x_max, n_bins):
+    """Прореживание кривой до разрешения экрана с сохранением экстремумов.
+
+    Ось x делится на n_bins бинов, в каждом оставляются точки минимума
+    и максимума в исходном порядке - пики и провалы не теряются.
+    """
+    out_x = np.empty(2 * n_bins)
+    out_y = np.empty(2 * n_bins)
+    i_min = np.full(n_bins, -1)
+    i_max = np.full(n_bins, -1)
+    scale = n_bins / (x_max - x_min)
+    for i in range(len(x)):
+        if np.isnan(y[i]) or x[i] < x_min or x[i] > x_max:
+            continue
+        b = min(int((x[i] - x_min) * scale), n_bins - 1)
+        if i_min[b] < 0 or y[i] < y[i_min[b]]:
+            i_min[b] = i
+        if i_max[b] < 0 or y[i] > y[i_max[b]]:
+            i_max[b] = i
+
+    k = 0
+    for b in range(n_bins):
+        if i_min[b] < 0:
+            continue
+        first = min(i_min[b], i_max[b])
+        second = max(i_min[b], i_max[b])
+        out_x[k] = x[first]
+        out_y[k] = y[first]
+        k += 1
+        if second != first:
+            out_x[k] = x[second]
+            out_y[k] = y[second]
+            k += 1
+    return out_x[:k], out_y[:k]
+
+
+@njit
+def peak_decimate(x, y, x_min, x_max, n_bins, baseline):
+    """Прореживание для тепловой карты: в бине остаётся значение,
+    наиболее удалённое от baseline (пустые бины - NaN)"""
+    out = np.full(n_bins, np.nan)
+    scale = n_bins / (x_max - x_min)
+    for i in range(len(x)):
+        if np.isnan(y[i]) or x[i] < x_min or x[i] > x_max:
+            continue
+        b = min(int((x[i] - x_min) * scale), n_bins - 1)
+        if np.isnan(out[b]) or abs(y[i] - baseline) > abs(out[b] - baseline):
+            out[b] = y[i]
+    return out
+
+
+@njit
+def rasterize_curve(x, y, x_min, x_max, y_min, y_max, mask):
+    """Растеризация ломаной в маску пикселей mask (строки - y, столбцы - x).
+    Для каждого отрезка закрашиваются столбцы между его концами и в каждом
+    столбце - диапазон строк, который отрезок пересекает"""
+    n_rows, n_cols = mask.shape
+    sx = n_cols / (x_max - x_min)
+    sy = n_rows / (y_max - y_min)
+    for i in range(1, len(x)):
+        if np.isnan(y[i - 1]) or np.isnan(y[i]):
+            continue
+        c0 = (x[i - 1] - x_min) * sx
+        c1 = (x[i] - x_min) * sx
+        r0 = (y[i - 1] - y_min) * sy
+        r1 = (y[i] - y_min) * sy
+        col_first = max(int(min(c0, c1)), 0)
+        col_last = min(int(max(c0, c1)), n_cols - 1)
+        for col in range(col_first, col_last + 1):
+            # Участок отрезка внутри столбца col
+            if c1 != c0:
+                t0 = min(max((col - c0) / (c1 - c0), 0.0), 1.0)
+                t1 = min(max((col + 1 - c0) / (c1 - c0), 0.0), 1.0)
+            else:
+                t0, t1 = 0.0, 1.0
+            ya = r0 + (r1 - r0) * t0
+            yb = r0 + (r1 - r0) * t1
+            row_first = max(int(min(ya, yb)), 0)
+            row_last = min(int(max(ya, yb)), n_rows - 1)
+            for row in range(row_first, row_last + 1):
+                mask[row, col] = 1
@@ -1,7 +1,7 @@
 import numpy as np
-from scipy.fftpack import dst, idst
 from numba import njit
 from .constants import ClosureType
+from .transforms import sine_transform, inverse_sine_transform
 
 
 class LMSolver:
@@ -30,11 +30,11 @@ class LMSolver:
 
     def fourier_transform(self, arr):
         """Дискретное синус-преобразование"""
-        return dst(arr, type=2)
+        return sine_transform(arr, dst_type=2)
 
     def inverse_fourier_transform(self, arr):
         """Обратное дискретное синус-преобразование"""
-        return idst(arr, type=2) / (2 * self.solver.N)
+        return inverse_sine_transform(arr, dst_type=2)
 
     def recount_fm(self):
         """Пересчет массива FM для текущей температуры"""
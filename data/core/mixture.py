@@ -0,0 +1,300 @@
+import numpy as np
+from .constants import *
+from .transforms import radial_grid, radial_transform, inverse_radial_transform
+
+
+class MixtureSolver:
+    """Решатель уравнения Орнштейна-Цернике для многокомпонентной смеси.
+
+    Корреляционные функции хранятся как массивы (n, n, Nd) по парам сортов.
+    В k-пространстве OZ решается пакетным обращением матриц n x n сразу
+    для всех k: H(k) = (I - C(k) D)^-1 C(k), D = diag(rho_i).
+    """
+
+    # Решение удовлетворяет OZ и замыканию (см. solve_sensitivities)
+    satisfies_oz = True
+
+    def __init__(self, n_components=2):
+        self.potential_type = PotentialType.LENNARD_JONES
+        self.closure = ClosureType.HNC
+
+        # Параметры системы
+        self.L = 10.0
+        self.Nd = 500
+
+        # Состояние: полная плотность и мольные доли сортов
+        self.Temperature = 1.0
+        self.Density = 0.5
+        self.X = np.full(n_components, 1.0 / n_components)
+
+        # Параметры потенциала по сортам (правила Лоренца-Бертло)
+        self.Sigma = np.ones(n_components)
+        self.Epsilon = np.ones(n_components)
+
+        # Параметры сходимости
+        self.convergence_dg = 1e-5
+        self.max_iterations = 1000
+        self.mixing = 0.3
+        # Глубина ускорения Нга/Андерсона (0 - простые итерации Пикара)
+        self.acceleration_depth = 3
+
+        # Точность итераций: 'double' или 'mixed' (float32 вдали от сходимости)
+        self.precision = 'double'
+
+        self._initialize_arrays()
+
+    @classmethod
+    def from_solver(cls, solver):
+        """Однокомпонентный решатель в точке состояния и на сетке solver
+        (LiquidSolver) с теми же параметрами сходимости"""
+        oz = cls(1)
+        oz.potential_type = solver.potential_type
+        oz.closure = solver.closure
+        oz.Temperature = solver.Temperature
+        oz.Density = solver.Density
+        oz.L = solver.L
+        oz.Nd = solver.Nd
+        oz.convergence_dg = solver.convergence_dg
+        oz.max_iterations = solver.max_iterations
+        oz.precision = solver.precision
+        oz._initialize_arrays()
+        return oz
+
+    @property
+    def n_components(self):
+        return len(self.X)
+
+    @property
+    def densities(self):
+        """Парциальные плотности rho_i = x_i * rho"""
+        return self.Density * np.asarray(self.X, dtype=float)
+
+    def _initialize_arrays(self):
+        """Инициализация сетки, потенциала и корреляционных функций"""
+        n = self.n_components
+        self.d_R = self.L / self.Nd
+        self.R_dist, self.K, self.d_K = radial_grid(self.Nd, self.d_R)[:3]
+
+        sigma = 0.5 * (self.Sigma[:, None] + self.Sigma[None, :])
+        epsilon = np.sqrt(self.Epsilon[:, None] * self.Epsilon[None, :])
+        self.Sigma_ij = sigma
+        self.Epsilon_ij = epsilon
+
+        r = self.R_dist[None, None, :]
+        s = sigma[:, :, None]
+        e = epsilon[:, :, None]
+        with np.errstate(over='ignore'):
+            if self.potential_type == PotentialType.LENNARD_JONES:
+                sr6 = (s / r) ** 6
+                self.U = 4.0 * e * (sr6 ** 2 - sr6)
+                self.ExpU = np.exp(-self.U / self.Temperature)
+            else:  # Hard Sphere
+                self.U = np.where(r < s, np.inf, 0.0)
+                self.ExpU = np.where(r < s, 0.0, 1.0)
+        # Ядро: exp(-U/T) обращается в ноль, там g = 0 при любом gamma
+        self.Core = self.ExpU == 0
+        self.BetaU = np.where(self.Core, 0.0, self.U / self.Temperature)
+
+        self.gamma = np.zeros((n, n, self.Nd))
+        self.c = self.ExpU - 1.0
+        self.h = self.c.copy()
+        self.g = self.ExpU.copy()
+        self.dg = np.inf
+        self.converged = False
+        self._history = []
+
+        self._full_potential = (self.ExpU, self.BetaU)
+        self._full_precision = self._full_potential
+        if self.precision == 'mixed':
+            self._set_precision(np.float32)
+
+    @property
+    def precision_switch_dg(self):
+        """Порог dg перехода на float64 (выше уровня шума float32)"""
+        return max(100 * self.convergence_dg, 1e-4)
+
+    def _set_precision(self, dtype):
+        """Перевод рабочих массивов итераций в заданную точность"""
+        self.ExpU, self.BetaU = (a.astype(dtype, copy=False) for a in self._full_precision)
+        self.gamma = self.gamma.astype(dtype)
+        self._history = []
+
+    def pair_distribution(self, gamma):
+        """g_ij(r) по замыканию для gamma_ij = h_ij - c_ij (внутри ядра ровно ноль)"""
+        if self.closure == ClosureType.HNC:
+            # exp(-U/T + gamma) одной экспонентой: ExpU * exp(gamma) дает 0 * inf в ядре
+            with np.errstate(over='ignore'):
+                return np.where(self.Core, 0.0, np.exp(gamma - self.BetaU)).astype(gamma.dtype, copy=False)
+        elif self.closure == ClosureType.PY:
+            return np.where(self.Core, 0.0, self.ExpU * (1.0 + gamma)).astype(gamma.dtype, copy=False)
+        raise ValueError(f"Замыкание {self.closure.name} не поддерживается для смесей")
+
+    def apply_closure(self, gamma):
+        """c_ij(r) = g_ij - 1 - gamma_ij"""
+        return self.pair_distribution(gamma) - 1.0 - gamma
+
+    def solve_oz(self, c_k):
+        """Пакетное решение OZ по всем k: H = (I - C D)^-1 C"""
+        n = self.n_components
+        C = np.moveaxis(c_k, -1, 0)  # (Nd, n, n)
+        A = np.eye(n, dtype=C.dtype) - C * self.densities.astype(C.dtype)[None, None, :]
+        H = np.linalg.solve(A, C)
+        return np.moveaxis(H, 0, -1)
+
+    def oz_map(self, gamma):
+        """Одна подстановка замыкания и OZ: gamma -> gamma'"""
+        c = self.apply_closure(gamma)
+        # OZ в k-пространстве для всех k и всех пар сортов одним вызовом
+        c_k = radial_transform(c, self.d_R)
+        h_k = self.solve_oz(c_k)
+        return c, inverse_radial_transform(h_k - c_k, self.d_R)
+
+    def is_oz_stable(self):
+        """det(I - C(k) D) > 0 при всех k для текущего gamma.
+        Иначе шаг OZ проходит через полюс и итерации расходятся"""
+        c_k = radial_transform(self.apply_closure(self.gamma), self.d_R)
+        C = np.moveaxis(c_k, -1, 0)
+        A = np.eye(self.n_components, dtype=C.dtype) - C * self.densities.astype(C.dtype)[None, None, :]
+        return bool(np.all(np.linalg.det(A) > 0))
+
+    def _set_density(self, density):
+        self.Density = density
+
+    def _set_coupling(self, coupling):
+        """Потенциал lambda * U вне ядра (lambda = 1 - полный потенциал)"""
+        exp_u, beta_u = self._full_potential
+        beta_u = coupling * beta_u
+        self._full_precision = (np.where(self.Core, 0.0, np.exp(-beta_u)), beta_u)
+        self._set_precision(self.gamma.dtype)
+
+    def _accelerate(self, gamma, residual):
+        """Шаг смешивания с ускорением Нга/Андерсона по последним итерациям"""
+        x, d = gamma.ravel(), residual.ravel()
+        self._history.append((x, d))
+        del self._history[:-(self.acceleration_depth + 1)]
+        if len(self._history) > 1:
+            dX = np.array([x - x_j for x_j, d_j in self._history[:-1]]).T
+            dD = np.array([d - d_j for x_j, d_j in self._history[:-1]]).T
+            a = np.linalg.lstsq(dD, d, rcond=None)[0]
+            x = x - dX @ a
+            d = d - dD @ a
+        return (x + self.mixing * d).reshape(gamma.shape).astype(gamma.dtype, copy=False)
+
+    def make_iteration(self):
+        self.c, new_gamma = self.oz_map(self.gamma)
+        residual = new_gamma - self.gamma
+        dg = float(np.max(np.abs(residual)))
+        if not np.isfinite(dg):
+            raise RuntimeError(f"Итерации OZ разошлись (T = {self.Temperature}, ρ = {self.Density})")
+        if dg > 10 * self.dg:
+            # Рост невязки - история ускорения сбрасывается
+            self._history = []
+        self.dg = dg
+        self.gamma = self._accelerate(self.gamma, residual)
+
+        self.h = self.gamma + self.c
+        self.g = self.h + 1.0
+        return dg
+
+    def _iterate(self, tolerance, max_iterations):
+        """Итерации при текущей плотности до dg < tolerance, возвращает число итераций"""
+        if max_iterations <= 0:
+            return 0
+        self._history = []
+        self.dg = np.inf
+        for iteration in range(max_iterations):
+            dg = self.make_iteration()
+            if self.gamma.dtype == np.float32:
+                # float32 до приближения к сходимости, затем уточнение во float64
+                if dg < self.precision_switch_dg:
+                    self._set_precision(np.float64)
+                continue
+            if dg < tolerance:
+                return iteration + 1
+        return max_iterations
+
+    def _continuation(self, set_value, target, name):
+        """Продолжение по параметру (плотность или сила связи) от значения,
+        при котором шаг OZ устойчив, к target. Промежуточные решения
+        считаются с грубым допуском; шаг делится пополам, пока OZ неустойчиво.
+        Возвращает число итераций"""
+        iterations = 0
+        value = target
+        set_value(value)
+        while not self.is_oz_stable():
+            value /= 2
+            if value < 1e-6 * target:
+                raise RuntimeError(f"Нет устойчивого начального приближения ({name} = {target})")
+            set_value(value)
+        while value < target and iterations < self.max_iterations:
+            iterations += self._iterate(self.precision_switch_dg, self.max_iterations - iterations)
+            step = target - value
+            set_value(value + step)
+            while not self.is_oz_stable():
+                step /= 2
+                if step < 1e-6 * target:
+                    raise RuntimeError(f"Продолжение остановилось на {name} = {value}")
+                set_value(value + step)
+            value += step
+        return iterations
+
+    def solve(self):
+        """Итерации до сходимости, возвращает число итераций.
+
+        Если шаг OZ из начального приближения неустойчив, решение ведётся
+        продолжением по плотности, а при неудаче (докритические изотермы
+        пересекают область расслоения) - по силе связи lambda * U при
+        целевой плотности. Флаг сходимости - в self.converged, итоговая
+        невязка - в self.dg; расходимость итераций вызывает RuntimeError.
+        """
+        target = self.Density
+        gamma = self.gamma.copy()
+        try:
+            iterations = self._continuation(self._set_density, target, 'ρ')
+        except RuntimeError:
+            self.Density = target
+            self.gamma = gamma
+            iterations = self._continuation(self._set_coupling, 1.0, 'λ')
+        finally:
+            self.Density = target
+        iterations += self._iterate(self.convergence_dg, self.max_iterations - iterations)
+        self.converged = self.dg < self.convergence_dg and self.gamma.dtype == np.float64
+        self._set_precision(np.float64)
+        self.c = self.apply_closure(self.gamma)
+        self.g = self.pair_distribution(self.gamma)
+        self.h = self.g - 1.0
+        return iterations
+
+    def get_total_correlation(self):
+        """Возвращает h_ij(r) формы (n, n, Nd)"""
+        return self.h
+
+    def calculate_pressure(self):
+        """Давление через вириальную теорему"""
+        rho = self.densities
+        rho_ij = rho[:, None] * rho[None, :]
+        if self.potential_type == PotentialType.LENNARD_JONES:
+            r = self.R_dist[None, None, :]
+            s = self.Sigma_ij[:, :, None]
+            e = self.Epsilon_ij[:, :, None]
+            sr6 = (s / r) ** 6
+            du = -24.0 * e * (2 * sr6 ** 2 - sr6) / r
+            integral = np.sum(r ** 3 * du * self.g, axis=-1) * self.d_R
+            beta_p = self.Density - (2 * np.pi / (3 * self.Temperature)) * np.sum(rho_ij * integral)
+        else:  # Hard Sphere: значения g_ij на контакте
+            contact = np.empty_like(self.Sigma_ij)
+            for i in range(self.n_components):
+                for j in range(self.n_components):
+                    idx = np.searchsorted(self.R_dist, self.Sigma_ij[i, j])
+                    contact[i, j] = self.g[i, j, min(idx, self.Nd - 1)]
+            beta_p = self.Density + (2 * np.pi / 3) * np.sum(rho_ij * self.Sigma_ij ** 3 * contact)
+        return beta_p * self.Temperature
+
+    def calculate_energy(self):
+        """Внутренняя энергия на частицу"""
+        if self.potential_type != PotentialType.LENNARD_JONES:
+            return 0.0
+        rho = self.densities
+        rho_ij = rho[:, None] * rho[None, :]
+        integral = np.sum(self.R_dist ** 2 * self.U * self.g, axis=-1) * self.d_R
+        return 2 * np.pi * np.sum(rho_ij * integral) / self.Density
@@ -0,0 +1,96 @@
+import multiprocessing as mp
+import queue
+from .shared_frames import FrameRing
+from .sweep import run_density_sweep
+
+
+def _solver_process(solver, ring_name, n_slots, capacity, notify_queue, free_slots, stop_event):
+    """Точка входа процесса решателя: кадры пишутся в кольцевой буфер,
+    в очередь уходят только короткие уведомления"""
+    ring = FrameRing(n_slots, capacity, name=ring_name)
+    state = {'slot': 0, 'progress': -1}
+
+    def is_running():
+        return not stop_event.is_set()
+
+    def on_progress(progress):
+        # Прогресс отправляем только при изменении, а не на каждой итерации
+        if progress != state['progress']:
+            state['progress'] = progress
+            notify_queue.put(('progress', progress))
+
+    def on_result(frame):
+        # Ждём, пока GUI освободит слот
+        while not free_slots.acquire(timeout=0.1):
+            if not is_running():
+                return
+        slot = state['slot']
+        n = ring.write(slot, frame['r'], frame['g'], frame['h'])
+        meta = {key: float(value) if key != 'iteration' else int(value)
+                for key, value in frame.items() if key not in ('r', 'g', 'h')}
+        notify_queue.put(('frame', slot, n, meta))
+        state['slot'] = (slot + 1) % ring.n_slots
+
+    try:
+        run_density_sweep(solver, on_progress, on_result, is_running)
+    except Exception as e:
+        notify_queue.put(('error', str(e)))
+    finally:
+        ring.close()
+        notify_queue.put(('finished',))
+
+
+class SolverProcess:
+    """Решатель в отдельном процессе с кадрами в разделяемой памяти"""
+
+    def __init__(self, solver, n_slots=4, capacity=None):
+        self.ctx = mp.get_context('spawn')
+        if capacity is None:
+            capacity = solver.max_grid_points if solver.auto_grid else solver.Nd
+        self.ring = FrameRing(n_slots, capacity)
+        self.notify_queue = self.ctx.Queue()
+        self.free_slots = self.ctx.Semaphore(n_slots)
+        self.stop_event = self.ctx.Event()
+        self.process = self.ctx.Process(
+            target=_solver_process,
+            args=(solver, self.ring.name, n_slots, self.ring.capacity,
+                  self.notify_queue, self.free_slots, self.stop_event),
+            daemon=True
+        )
+
+    def start(self):
+        self.process.start()
+
+    def poll(self):
+        """Все накопившиеся уведомления без блокировки"""
+        messages = []
+        while True:
+            try:
+                messages.append(self.notify_queue.get_nowait())
+            except queue.Empty:
+                return messages
+
+    def frame(self, slot, n):
+        """Кадр из слота без копирования: (r, g, h)"""
+        return self.ring.read(slot, n)
+
+    def release(self):
+        """Возврат слота решателю после отображения кадра"""
+        self.free_slots.release()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def is_alive(self):
+        return self.process.is_alive()
+
+    @property
+    def exitcode(self):
+        return self.process.exitcode
+
+    def close(self):
+        self.stop()
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.ring.close()
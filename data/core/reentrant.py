@@ -0,0 +1,182 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from functools import lru_cache
+import numpy as np
+from numba import njit
+from .constants import *
+from .solver import calculate_h, relax_iteration
+from .analytic import py_hard_sphere_on_grid
+
+
+@dataclass(frozen=True)
+class GridSpec:
+    """Неизменяемое описание сетки"""
+    L: float = 10.0
+    Nd: int = 500
+
+    @property
+    def At(self):
+        return self.L / self.Nd
+
+
+@dataclass(frozen=True)
+class StateSpec:
+    """Неизменяемое описание задачи: сетка, потенциал, замыкание и точка состояния"""
+    grid: GridSpec
+    potential_type: PotentialType = PotentialType.LENNARD_JONES
+    closure: ClosureType = ClosureType.PY
+    temperature: float = 0.5
+    density: float = 0.1
+    convergence_dg: float = 1e-5
+    max_iterations: int = 1000
+    precision: str = 'double'
+
+    @property
+    def precision_switch_dg(self):
+        return max(100 * self.convergence_dg, 1e-4)
+
+    @classmethod
+    def from_solver(cls, solver, **changes):
+        spec = cls(
+            grid=GridSpec(solver.L, solver.Nd),
+            potential_type=solver.potential_type,
+            closure=solver.closure,
+            temperature=solver.Temperature,
+            density=solver.Density,
+            convergence_dg=solver.convergence_dg,
+            max_iterations=solver.max_iterations,
+            precision=solver.precision,
+        )
+        return replace(spec, **changes)
+
+
+@dataclass(frozen=True)
+class StateResult:
+    spec: StateSpec
+    r: np.ndarray
+    g: np.ndarray
+    h: np.ndarray
+    iterations: int
+    dg: float
+
+
+@lru_cache(maxsize=16)
+def potential_arrays(grid, potential_type, dtype=np.float64):
+    """Общие для всех потоков массивы r и exp(-U) (только чтение)"""
+    r = np.linspace(0, grid.L, grid.Nd)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if potential_type == PotentialType.LENNARD_JONES:
+            r_safe = np.where(r > 0, r, np.inf)
+            exp_u = np.exp(-4 * ((1 / r_safe) ** 12 - (1 / r_safe) ** 6))
+        else:  # Hard Sphere
+            exp_u = np.where(r < 1, 0.0, 1.0)
+    exp_u[0] = 0
+    r = r.astype(dtype)
+    exp_u = exp_u.astype(dtype)
+    r.setflags(write=False)
+    exp_u.setflags(write=False)
+    return r, exp_u
+
+
+class Workspace:
+    """Рабочие массивы одного вызова решателя"""
+
+    def __init__(self, Nd):
+        self.Nd = Nd
+        self._arrays = {}
+
+    def arrays(self, dtype=np.float64):
+        """(h, g, g_prev) заданной точности, создаются при первом обращении"""
+        dtype = np.dtype(dtype)
+        if dtype not in self._arrays:
+            self._arrays[dtype] = tuple(np.empty(self.Nd, dtype=dtype) for _ in range(3))
+        return self._arrays[dtype]
+
+
+@njit(nogil=True)
+def _solve_kernel(r, new_h, h, g, g_prev, density, at, convergence_dg, max_iterations):
+    """Итерации relax_iteration (тот же шаг, что LiquidSolver.make_iteration)
+    без GIL до сходимости"""
+    dg = np.inf
+    iteration = 0
+    for iteration in range(max_iterations):
+        dg = relax_iteration(r, new_h, h, g, g_prev, density, at)
+        if dg < convergence_dg:
+            break
+    return iteration + 1, dg
+
+
+def solve_state(spec, workspace=None):
+    """Реентерабельное решение одной точки состояния.
+
+    Общие данные (сетка, потенциал) только читаются, всё изменяемое
+    лежит в workspace, поэтому вызовы из разных потоков независимы.
+    """
+    r, exp_u = potential_arrays(spec.grid, spec.potential_type)
+    Nd = spec.grid.Nd
+
+    if spec.potential_type == PotentialType.HARD_SPHERE and spec.closure == ClosureType.PY:
+        c, h, g = py_hard_sphere_on_grid(r, spec.density)
+        return StateResult(spec, r, g, h, 0, 0.0)
+
+    if workspace is None or workspace.Nd != Nd:
+        workspace = Workspace(Nd)
+    h, g, g_prev = workspace.arrays(np.float64)
+    g[0] = 0
+    h[0] = -1
+    g[1:] = 1.0
+    h[1:] = exp_u[1:] - 1
+
+    # calculate_h не зависит от g и h - считается один раз на точку
+    new_h = calculate_h(r, exp_u, spec.density, spec.temperature, 1)
+
+    iterations, dg = 0, np.inf
+    if spec.precision == 'mixed':
+        # Ранние итерации во float32 до порога перехода
+        h32, g32, g_prev32 = workspace.arrays(np.float32)
+        h32[:] = h
+        g32[:] = g
+        r32 = potential_arrays(spec.grid, spec.potential_type, np.float32)[0]
+        iterations, dg = _solve_kernel(r32, new_h.astype(np.float32), h32, g32, g_prev32,
+                                       spec.density, spec.grid.At, spec.precision_switch_dg,
+                                       spec.max_iterations)
+        h[:] = h32
+        g[:] = g32
+
+    if iterations < spec.max_iterations:
+        extra, dg = _solve_kernel(r, new_h, h, g, g_prev, spec.density, spec.grid.At,
+                                  spec.convergence_dg, spec.max_iterations - iterations)
+        iterations += extra
+    return StateResult(spec, r, g.copy(), h.copy(), int(iterations), float(dg))
+
+
+_local = threading.local()
+
+
+def _solve_in_thread(spec):
+    """solve_state с рабочими массивами, закреплёнными за потоком"""
+    workspace = getattr(_local, 'workspace', None)
+    if workspace is None or workspace.Nd != spec.grid.Nd:
+        workspace = _local.workspace = Workspace(spec.grid.Nd)
+    return solve_state(spec, workspace)
+
+
+def iter_solve_states(specs, max_workers=None, is_running=lambda: True):
+    """Решение точек состояния в пуле потоков; результаты выдаются в порядке specs.
+    При остановке ещё не начатые задачи отменяются"""
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_solve_in_thread, spec) for spec in specs]
+        try:
+            for future in futures:
+                if not is_running():
+                    break
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def solve_states(specs, max_workers=None):
+    """Решение набора точек состояния в пуле потоков, результаты в порядке specs"""
+    return list(iter_solve_states(specs, max_workers))
@@ -0,0 +1,110 @@
+import json
+from pathlib import Path
+import numpy as np
+from numpy.lib.format import open_memmap
+from .decimation import peak_decimate
+
+
+META_DTYPE = np.dtype([
+    ('density', 'f8'),
+    ('temperature', 'f8'),
+    ('iteration', 'i8'),
+    ('g_max', 'f8'),
+    ('h_max', 'f8'),
+    ('n', 'i8'),
+])
+
+
+class ResultStore:
+    """Хранилище результатов развёртки в memory-mapped файлах .npy.
+
+    Кадры r, g(r), h(r) лежат в массивах (n_frames, n_points); сетки разной
+    длины дополняются до n_points, фактическая длина хранится в meta['n'].
+    """
+
+    def __init__(self, path, mode='r'):
+        self.path = Path(path)
+        header = json.loads((self.path / 'header.json').read_text())
+        self.count = header['count']
+        self.r = open_memmap(self.path / 'r.npy', mode=mode)
+        self.g = open_memmap(self.path / 'g.npy', mode=mode)
+        self.h = open_memmap(self.path / 'h.npy', mode=mode)
+        self.meta = open_memmap(self.path / 'meta.npy', mode=mode)
+
+    @classmethod
+    def create(cls, path, n_frames, n_points):
+        """Создание пустого хранилища на n_frames точек состояния"""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        for name in ('r', 'g', 'h'):
+            open_memmap(path / f'{name}.npy', mode='w+', dtype=np.float64,
+                        shape=(n_frames, n_points)).flush()
+        open_memmap(path / 'meta.npy', mode='w+', dtype=META_DTYPE, shape=(n_frames,)).flush()
+        (path / 'header.json').write_text(json.dumps({'count': 0}))
+        return cls(path, mode='r+')
+
+    @classmethod
+    def open(cls, path):
+        """Открытие сохранённого хранилища только для чтения"""
+        return cls(path, mode='r')
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def capacity(self):
+        return self.g.shape[0]
+
+    def append(self, frame, temperature=0.0):
+        """Добавление кадра из результата решателя"""
+        if self.count >= self.capacity:
+            raise IndexError(f"Хранилище заполнено ({self.capacity} кадров)")
+        n = len(frame['r'])
+        i = self.count
+        self.r[i, :n] = frame['r']
+        self.g[i, :n] = frame['g']
+        self.h[i, :n] = frame['h']
+        self.r[i, n:] = np.nan
+        self.g[i, n:] = np.nan
+        self.h[i, n:] = np.nan
+        self.meta[i] = (frame['ρ'], temperature, frame['iteration'],
+                        frame['g_max'], frame['h_max'], n)
+        self.count += 1
+        (self.path / 'header.json').write_text(json.dumps({'count': self.count}))
+
+    def frame(self, i):
+        """Кадр i без копирования: (r, g, h)"""
+        n = self.meta['n'][i]
+        return self.r[i, :n], self.g[i, :n], self.h[i, :n]
+
+    def densities(self):
+        return np.asarray(self.meta['density'][:self.count])
+
+    def r_range(self):
+        n = self.meta['n'][:self.count]
+        return 0.0, float(np.max(self.r[np.arange(self.count), n - 1]))
+
+    def max_points(self):
+        """Число точек самой подробной сетки среди сохранённых кадров"""
+        return int(np.max(self.meta['n'][:self.count]))
+
+    def heatmap_row(self, i, key, n_bins, r_range):
+        """Строка тепловой карты для кадра i: n_bins бинов с сохранением пиков"""
+        n = self.meta['n'][i]
+        values = self.g if key == 'g' else self.h
+        baseline = 1.0 if key == 'g' else 0.0
+        return peak_decimate(self.r[i, :n], values[i, :n], r_range[0], r_range[1], n_bins, baseline)
+
+    def heatmap(self, key='g', n_bins=800):
+        """Матрица (кадры x бины r), прореженная до n_bins с сохранением пиков"""
+        r_range = self.r_range()
+        # Бинов не больше, чем точек в самой подробной сетке
+        n_bins = min(n_bins, self.max_points())
+        image = np.full((self.count, n_bins), np.nan)
+        for i in range(self.count):
+            image[i] = self.heatmap_row(i, key, n_bins, r_range)
+        return image, r_range
+
+    def flush(self):
+        for arr in (self.r, self.g, self.h, self.meta):
+            arr.flush()
@@ -0,0 +1,122 @@
+import numpy as np
+from scipy.sparse.linalg import LinearOperator, gmres
+from .constants import *
+from .transforms import radial_transform, inverse_radial_transform
+
+
+def _potential(r, potential_type):
+    """u(r) и r*u'(r) для LJ; для твердых сфер u = inf внутри ядра"""
+    if potential_type == PotentialType.LENNARD_JONES:
+        r6 = r ** -6
+        return 4 * (r6 ** 2 - r6), -24 * (2 * r6 ** 2 - r6)
+    return np.where(r < 1, np.inf, 0.0), np.zeros_like(r)
+
+
+def _pair_h(solver):
+    """h(r) однокомпонентного решения (MixtureSolver хранит h формы (1, 1, Nd))"""
+    h = np.asarray(solver.h, dtype=float)
+    return h[0, 0] if h.ndim == 3 else h
+
+
+def solve_sensitivities(solver, tol=1e-10):
+    """Производные dg/drho и dg/dT из линеаризованной системы OZ + замыкание.
+
+    В точке сходимости c(r) восстанавливается из h(r) по OZ, затем для
+    d(gamma) решается линейная система (I - M) d(gamma) = b методом GMRES,
+    где M = F^-1 [(1/(1 - rho C)^2 - 1) F (dc/dgamma * .)]. Одна линейная
+    задача заменяет два нелинейных решения в точках rho +- delta (T +- delta).
+    Поддерживаются замыкания PY и HNC. solver должен удовлетворять OZ
+    и замыканию (satisfies_oz), например MixtureSolver(1).
+    dgamma_drho - производная gamma = h - c для предиктора по плотности.
+    """
+    if not getattr(solver, 'satisfies_oz', False):
+        raise ValueError(f"{type(solver).__name__} не решает OZ с замыканием - линеаризация неприменима")
+    R = solver.R_dist
+    offset = 1 if R[0] == 0 else 0
+    r = R[offset:]
+    d_R = r[1] - r[0]
+    rho = solver.Density
+    T = solver.Temperature
+    h = _pair_h(solver)[offset:]
+
+    # c(r) и gamma(r) из h(r) по OZ
+    h_k = radial_transform(h, d_R)
+    c_k = h_k / (1 + rho * h_k)
+    c = inverse_radial_transform(c_k, d_R)
+    gamma = h - c
+
+    u, r_du = _potential(r, solver.potential_type)
+    with np.errstate(invalid='ignore', over='ignore'):
+        boltzmann = np.exp(-u / T)
+        beta_u_T = np.where(boltzmann > 0, u / T ** 2, 0.0)
+
+    # Линеаризация замыкания: dc = A d(gamma) + B dT
+    if solver.closure == ClosureType.PY:
+        A = boltzmann - 1
+        B_T = boltzmann * beta_u_T * (1 + gamma)
+    elif solver.closure == ClosureType.HNC:
+        A = boltzmann * np.exp(gamma) - 1
+        B_T = boltzmann * np.exp(gamma) * beta_u_T
+    else:
+        raise ValueError(f"Линеаризация для замыкания {solver.closure.name} не реализована")
+
+    denominator = 1 - rho * c_k
+    W = 1 / denominator ** 2 - 1
+
+    def apply_m(x):
+        return inverse_radial_transform(W * radial_transform(A * x, d_R), d_R)
+
+    n = len(r)
+    operator = LinearOperator((n, n), matvec=lambda x: x - apply_m(x), dtype=float)
+
+    def solve(rhs_k, B):
+        b = inverse_radial_transform(rhs_k + W * radial_transform(B, d_R), d_R)
+        d_gamma, info = gmres(operator, b, rtol=tol, atol=0.0, restart=50, maxiter=200)
+        dg = d_gamma + A * d_gamma + B
+        pad = np.zeros(offset)
+        return np.concatenate((pad, d_gamma)), np.concatenate((pad, dg)), info
+
+    # Явная зависимость OZ от плотности: d/drho [C / (1 - rho C)] = C^2 / (1 - rho C)^2
+    dgamma_drho, dg_drho, info_rho = solve(c_k ** 2 / denominator ** 2, np.zeros(n))
+    dgamma_dT, dg_dT, info_T = solve(np.zeros(n), B_T)
+
+    return {
+        'dg_drho': dg_drho,
+        'dg_dT': dg_dT,
+        'dgamma_drho': dgamma_drho,
+        'c': np.concatenate((np.zeros(offset), c)),
+        'c_k0': float(4 * np.pi * np.sum(r ** 2 * c) * d_R),
+        'converged': info_rho == 0 and info_T == 0 and getattr(solver, 'converged', True),
+    }
+
+
+def derivative_properties(solver, sensitivities):
+    """Производные термодинамические величины из dg/drho и dg/dT"""
+    R = solver.R_dist
+    offset = 1 if R[0] == 0 else 0
+    r = R[offset:]
+    d_R = r[1] - r[0]
+    rho = solver.Density
+    T = solver.Temperature
+    g = _pair_h(solver)[offset:] + 1
+    dg_drho = sensitivities['dg_drho'][offset:]
+    dg_dT = sensitivities['dg_dT'][offset:]
+
+    # Сжимаемостный маршрут: beta dP/drho = 1 - rho c(k=0)
+    dp_drho = T * (1 - rho * sensitivities['c_k0'])
+    result = {
+        'dP_drho': dp_drho,
+        'compressibility': 1 / (rho * dp_drho),
+    }
+
+    if solver.potential_type == PotentialType.LENNARD_JONES:
+        u, r_du = _potential(r, solver.potential_type)
+        virial = np.sum(r ** 2 * r_du * g) * d_R
+        # Вириальный маршрут с dg/drho и dg/dT
+        result['dP_drho_virial'] = (T - (4 * np.pi / 3) * rho * virial
+                                    - (2 * np.pi / 3) * rho ** 2 * np.sum(r ** 2 * r_du * dg_drho) * d_R)
+        result['dP_dT'] = rho - (2 * np.pi / 3) * rho ** 2 * np.sum(r ** 2 * r_du * dg_dT) * d_R
+        # Избыточная теплоемкость на частицу: dU/dT при постоянной плотности
+        cv_excess = 2 * np.pi * rho * np.sum(r ** 2 * u * dg_dT) * d_R
+        result['heat_capacity'] = 1.5 + cv_excess
+    return result
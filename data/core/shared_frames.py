@@ -0,0 +1,48 @@
+import numpy as np
+from multiprocessing import shared_memory
+
+
+class FrameRing:
+    """Кольцевой буфер кадров r, g(r), h(r) в разделяемой памяти.
+
+    Каждый слот хранит массив (3, capacity); длина кадра передаётся
+    в уведомлении, так что сетки разного размера укладываются в один буфер.
+    """
+
+    def __init__(self, n_slots, capacity, name=None):
+        self.n_slots = n_slots
+        self.capacity = capacity
+        nbytes = n_slots * 3 * capacity * np.dtype(np.float64).itemsize
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+            self.owner = True
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            self.owner = False
+        self.frames = np.ndarray((n_slots, 3, capacity), dtype=np.float64, buffer=self.shm.buf)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def write(self, slot, r, g, h):
+        """Запись кадра в слот, возвращает длину кадра"""
+        n = len(r)
+        if n > self.capacity:
+            raise ValueError(f"Кадр из {n} точек не помещается в буфер ({self.capacity})")
+        frame = self.frames[slot]
+        frame[0, :n] = r
+        frame[1, :n] = g
+        frame[2, :n] = h
+        return n
+
+    def read(self, slot, n):
+        """Представления r, g, h слота без копирования"""
+        frame = self.frames[slot]
+        return frame[0, :n], frame[1, :n], frame[2, :n]
+
+    def close(self):
+        self.frames = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
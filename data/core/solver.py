@@ -3,7 +3,7 @@ from numba import njit
 from .constants import *
 
 
-@njit
+@njit(nogil=True)
 def calculate_omega(g, density, f2, temperature, r, closure, alpha=1.0):
     """Расчет бридж-функции с обработкой крайних случаев"""
     if closure == 1:  # PY (Percus-Yevick)
@@ -38,7 +38,7 @@ def calculate_omega(g, density, f2, temperature, r, closure, alpha=1.0):
 
     else:  # По умолчанию (должно вызывать ошибку в отладочном режиме)
         return 0.0
-@njit
+@njit(nogil=True)
 def calculate_h(r_dist, exp_u, density, temperature, closure_code):
     """Расчет h(r) с обработкой граничных условий"""
     h = np.zeros_like(r_dist)
@@ -64,7 +64,39 @@ def calculate_h(r_dist, exp_u, density, temperature, closure_code):
     return h
 
 
+@njit(nogil=True)
+def relax_iteration(r, new_h, h, g, g_prev, density, at):
+    """Один шаг итераций LiquidSolver на месте: релаксация h к new_h,
+    интегральная поправка и релаксация g. Единая реализация для
+    LiquidSolver.make_iteration и реентерабельного решателя (reentrant).
+    Возвращает dg = max|g - g_prev| / mean|g|"""
+    n = len(r)
+    g_prev[:] = g
+    for i in range(n):
+        h[i] = 0.3 * new_h[i] + 0.7 * h[i]  # Сильная релаксация
+
+    integral = 0.0
+    for i in range(1, n):
+        r_nonzero = r[i] if r[i] > 0 else 1e-10
+        integral += h[i] * r_nonzero ** 2
+        correction = 2 * np.pi * density * (integral * at) / r_nonzero
+        new_g = h[i] + 1 - correction
+        g[i] = 0.2 * new_g + 0.8 * g_prev[i]  # Очень сильная релаксация
+    g[0] = 0  # Граничное условие
+
+    diff = 0.0
+    total = 0.0
+    for i in range(n):
+        diff = max(diff, abs(g[i] - g_prev[i]))
+        total += abs(g[i])
+    return diff / (total / n)
+
+
 class LiquidSolver:
+    # make_iteration всегда использует PY через calculate_h и не решает OZ
+    # с выбранным замыканием - линеаризация OZ около его результата неприменима
+    satisfies_oz = False
+
     def __init__(self):
         self.equation_type = EquationType.EQUILIBRIUM
         self.potential_type = PotentialType.LENNARD_JONES
@@ -89,6 +121,23 @@ class LiquidSolver:
         self.max_iterations = 1000
         self.alpha = 1.0
 
+        # Автоматический выбор сетки (L, Nd)
+        self.auto_grid = False
+        self.grid_tolerance = 1e-3
+        self.max_grid_points = 10000
+
+        # Начальное приближение LJ по системе отсчёта твердых сфер (WCA)
+        self.reference_guess = False
+
+        # Производные dg/drho, dg/dT после сходимости (линеаризованная OZ)
+        self.sensitivities = False
+
+        # Число потоков для независимых точек развёртки
+        self.n_threads = 1
+
+        # Точность итераций: 'double' или 'mixed' (float32 вдали от сходимости)
+        self.precision = 'double'
+
         # Текущие состояния
         self.Temperature = self.T0
         self.Density = self.rho0
@@ -123,10 +172,29 @@ class LiquidSolver:
         self.g[1:] = 1.0
         self.h[1:] = self.ExpU[1:] - 1
 
-    def make_iteration(self):
-        self.g_prev = self.g.copy()
+        # Смешанная точность: ранние итерации во float32
+        self._full_precision = (self.R_dist, self.ExpU)
+        if self.precision == 'mixed':
+            for name in ('R_dist', 'ExpU', 'g', 'h', 'g_prev'):
+                setattr(self, name, getattr(self, name).astype(np.float32))
+
+    @property
+    def precision_switch_dg(self):
+        """Порог dg перехода на float64 (выше уровня шума float32)"""
+        return max(100 * self.convergence_dg, 1e-4)
+
+    def is_reduced_precision(self):
+        return self.g.dtype == np.float32
+
+    def promote_precision(self):
+        """Переход к float64 для финальных итераций"""
+        self.R_dist, self.ExpU = self._full_precision
+        self.g = self.g.astype(np.float64)
+        self.h = self.h.astype(np.float64)
+        self.g_prev = self.g_prev.astype(np.float64)
 
-        # 1. Расчёт нового h(r) с релаксацией
+    def make_iteration(self):
+        # 1. Расчёт нового h(r)
         new_h = calculate_h(
             r_dist=self.R_dist,
             exp_u=self.ExpU,
@@ -134,21 +202,13 @@ class LiquidSolver:
             temperature=self.Temperature,
             closure_code=1  # PY
         )
-        self.h = 0.3 * new_h + 0.7 * self.h  # Сильная релаксация
-
-        # 2. Интегральная поправка (исправленная версия)
-        r_nonzero = np.where(self.R_dist > 0, self.R_dist, 1e-10)
-        integral = np.cumsum(self.h[1:] * r_nonzero[1:] ** 2) * self.At
-        correction = 2 * np.pi * self.Density * integral / r_nonzero[1:]
-
-        # 3. Обновление g(r) с двойной релаксацией
-        new_g = self.h[1:] + 1 - correction
-        self.g[1:] = 0.2 * new_g + 0.8 * self.g_prev[1:]  # Очень сильная релаксация
-        self.g[0] = 0  # Граничное условие
 
-        # 4. Контроль сходимости
-        dg = np.max(np.abs(self.g - self.g_prev)) / (np.mean(np.abs(self.g)) + 1e-10)
-        return dg
+        # 2-4. Релаксация h, интегральная поправка, релаксация g и dg - на месте
+        self.h = np.ascontiguousarray(self.h, dtype=self.g.dtype)
+        if self.g_prev.shape != self.g.shape or self.g_prev.dtype != self.g.dtype:
+            self.g_prev = np.empty_like(self.g)
+        return relax_iteration(self.R_dist, new_h, self.h, self.g, self.g_prev,
+                               float(self.Density), self.At)
 
     def get_total_correlation(self):
         """Возвращает h(r) с гарантией правильной размерности"""
@@ -0,0 +1,158 @@
+import logging
+import numpy as np
+from .constants import PotentialType, ClosureType, SolutionMethod
+from .analytic import solve_hard_sphere_py, reference_initial_guess, reference_initial_gamma
+from .mixture import MixtureSolver
+from .sensitivity import solve_sensitivities
+from .thermodynamics import calculate_all_thermodynamics
+from .reentrant import StateSpec, iter_solve_states
+
+logger = logging.getLogger(__name__)
+
+
+def density_points(solver):
+    """Точки развёртки по плотности"""
+    return np.arange(solver.rho0, solver.rhok + solver.drho, solver.drho)
+
+
+def converge(solver, is_running=lambda: True, on_iteration=None, analytic=True):
+    """Итерации решателя до сходимости, возвращает (число итераций, dg).
+    analytic=False отключает аналитический путь для твердых сфер PY
+    (например, при замерах самого итерационного метода)"""
+    if analytic and solver.potential_type == PotentialType.HARD_SPHERE and solver.closure == ClosureType.PY:
+        # Для твердых сфер PY решение известно аналитически
+        if solver.is_reduced_precision():
+            solver.promote_precision()
+        solve_hard_sphere_py(solver)
+        return 0, 0.0
+
+    iteration, dg = 0, np.inf
+    for iteration in range(solver.max_iterations):
+        if not is_running():
+            break
+
+        solver.make_iteration()
+        dg = np.max(np.abs(solver.g - solver.g_prev)) / np.mean(np.abs(solver.g))
+
+        if on_iteration is not None:
+            on_iteration(iteration)
+
+        if solver.is_reduced_precision():
+            # float32 до приближения к сходимости, затем уточнение во float64
+            if dg < solver.precision_switch_dg:
+                solver.promote_precision()
+            continue
+
+        if dg < solver.convergence_dg:
+            break
+    if solver.is_reduced_precision():
+        # Остановка или исчерпание итераций до порога перехода:
+        # результат всё равно возвращается во float64
+        solver.promote_precision()
+    return iteration + 1, dg
+
+
+def make_frame(r, g, rho, iterations):
+    """Результат расчёта одной точки состояния"""
+    # Добавляем расчет h(r) = g(r) - 1
+    h_r = g - 1
+    return {
+        'r': r,
+        'g': g,
+        'h': h_r,
+        'ρ': rho,
+        'iteration': iterations,
+        'h_max': np.max(h_r),  # Максимальное значение h(r)
+        'g_max': np.max(g)  # Максимальное значение g(r)
+    }
+
+
+def run_parallel_sweep(solver, on_progress, on_result, is_running=lambda: True):
+    """Развёртка по плотности в пуле потоков: точки решаются независимо
+    через реентерабельный solve_state по неизменяемым StateSpec"""
+    specs = [StateSpec.from_solver(solver, density=rho) for rho in density_points(solver)]
+    for i, result in enumerate(iter_solve_states(specs, solver.n_threads, is_running)):
+        on_progress(int((i + 1) / len(specs) * 100))
+        on_result(make_frame(result.r, result.g, result.spec.density, result.iterations))
+
+
+def run_oz_sweep(solver, on_progress, on_result, is_running=lambda: True):
+    """Развёртка по плотности Фурье-методом (MixtureSolver с одним компонентом)
+    на сетке, заданной пользователем. Решение предыдущей точки - начальное
+    приближение следующей; при расчёте производных используется линейный
+    предиктор gamma + drho * dgamma/drho. Первая точка для LJ при
+    reference_guess начинается с приближения WCA"""
+    oz = MixtureSolver.from_solver(solver)
+    rho0 = solver.rho0
+    rhok = solver.rhok
+
+    for i, rho in enumerate(density_points(solver)):
+        if not is_running():
+            break
+
+        on_progress(int((rho - rho0) / (rhok - rho0) * 100))
+        oz.Density = rho
+        if i == 0 and solver.reference_guess and solver.potential_type == PotentialType.LENNARD_JONES:
+            # Решение предыдущей точки ближе к ответу, чем WCA, поэтому только холодный старт
+            reference_initial_gamma(oz)
+        iterations = oz.solve()
+
+        frame = make_frame(oz.R_dist, oz.g[0, 0], rho, iterations)
+        frame['converged'] = oz.converged
+        if solver.sensitivities:
+            sensitivities = solve_sensitivities(oz)
+            frame.update(calculate_all_thermodynamics(oz, sensitivities))
+            frame['sensitivities_converged'] = bool(sensitivities['converged'])
+            if sensitivities['converged']:
+                # Предиктор для следующей точки по dgamma/drho
+                predicted = oz.gamma[0, 0] + solver.drho * sensitivities['dgamma_drho']
+                oz.gamma = predicted.reshape(oz.gamma.shape)
+        on_result(frame)
+
+
+def run_density_sweep(solver, on_progress, on_result, is_running=lambda: True):
+    """Развёртка по плотности при текущей температуре решателя"""
+    if solver.solution_method == SolutionMethod.FOURIER_TRANSFORM:
+        run_oz_sweep(solver, on_progress, on_result, is_running)
+        return
+
+    if solver.sensitivities:
+        # Итерации LiquidSolver не решают OZ с замыканием - линеаризация неприменима
+        logger.warning("Производные по плотности и температуре доступны только для метода %s",
+                       SolutionMethod.FOURIER_TRANSFORM.value)
+
+    if solver.n_threads > 1 and not (solver.auto_grid or solver.reference_guess):
+        # Без подбора сетки точки независимы
+        run_parallel_sweep(solver, on_progress, on_result, is_running)
+        return
+
+    rho0 = solver.rho0
+    rhok = solver.rhok
+
+    grid_cache = None
+    if solver.auto_grid:
+        from .autogrid import GridCache
+        # При недостижимой точности остаётся сетка, заданная пользователем
+        grid_cache = GridCache(solver.grid_tolerance, max_Nd=solver.max_grid_points,
+                               fallback_grid=(solver.L, solver.Nd))
+
+    for rho in density_points(solver):
+        if not is_running():
+            break
+
+        solver.Density = rho
+        if grid_cache is not None:
+            # Сетка подбирается один раз на область состояний
+            solver.L, solver.Nd = grid_cache.grid_for(solver)
+            solver.At = solver.L / solver.Nd
+        solver._initialize_arrays()
+        if solver.potential_type == PotentialType.LENNARD_JONES and solver.reference_guess:
+            reference_initial_guess(solver)
+
+        progress = int((rho - rho0) / (rhok - rho0) * 100)
+        iterations, dg = converge(solver, is_running, lambda it: on_progress(progress))
+
+        frame = make_frame(solver.R_dist, solver.g, rho, iterations)
+        if grid_cache is not None:
+            frame['grid_error'] = grid_cache.error_for(solver)
+        on_result(frame)
@@ -1,40 +1,69 @@
 import numpy as np
 from typing import Dict, Any
-from .constants import KB, NA
+from .constants import KB, NA, PotentialType, ClosureType
+from .sensitivity import derivative_properties, _pair_h
 
 
-def calculate_all_thermodynamics(solver) -> Dict[str, Any]:
-    """Расчет всех термодинамических параметров"""
-    # Расчет давления
-    integral_p = np.sum(solver.h * solver.R_dist ** 2 * solver.d_R)
-    pressure = solver.Density * solver.Temperature * (1 + 2 * np.pi * solver.Density * integral_p)
+def pressure_energy_from_g(r, g, potential_type, temperature, density, sigma=1.0):
+    """Давление (вириальный маршрут) и энергия на частицу по g(r).
 
-    # Расчет энергии
-    if solver.potential_type == 'LJ':
-        U = np.sum(solver.F2 * solver.Temperature * (solver.h + 1) * solver.R_dist ** 2 * solver.d_R)
-        energy = 2 * np.pi * solver.Density * U
-    else:
-        energy = 0.0
+    Общая формула для всех методов решения. Ядро, где exp(-u/T) < 1e-13,
+    исключается: там g = 0 точно, а u ~ r^-12 умножало бы на ноль шум
+    сетки и давало расходящиеся по Nd интегралы.
+    Для твердых сфер давление - по контактному значению g(sigma+), энергия - 0.
+    """
+    r = np.asarray(r, dtype=float)
+    g = np.asarray(g, dtype=float)
+    mask = r > 0
+    r, g = r[mask], g[mask]
+    d_R = r[1] - r[0]
+    if potential_type == PotentialType.LENNARD_JONES:
+        r6 = r ** -6
+        u = 4 * (r6 ** 2 - r6)
+        r_du = -24 * (2 * r6 ** 2 - r6)
+        outside = u / temperature < 30
+        virial = np.sum((r ** 2 * r_du * g)[outside]) * d_R
+        pressure = density * temperature - (2 * np.pi / 3) * density ** 2 * virial
+        energy = 2 * np.pi * density * np.sum((r ** 2 * u * g)[outside]) * d_R
+        return float(pressure), float(energy)
+    # Контактное значение g(sigma+) линейной экстраполяцией по двум первым узлам вне ядра
+    i = min(np.searchsorted(r, sigma), len(r) - 2)
+    contact = g[i] + (g[i] - g[i + 1]) * (r[i] - sigma) / (r[i + 1] - r[i])
+    pressure = density * temperature * (1 + (2 * np.pi / 3) * density * sigma ** 3 * contact)
+    return float(pressure), 0.0
 
-    # Расчет химического потенциала
-    him_pot = 0.0
-    for i in range(solver.N):
-        omega = solver.w[i] - (solver.Density * solver.F2[i] / solver.Temperature)
-        if solver.closure == 'MS_mod':
-            mbr1 = -(1 / 6) * omega ** 2
-        c2 = solver.h[i] - solver.w[i] - 0.5 * solver.h[i] * (solver.w[i] + mbr1)
-        him_pot += c2 * solver.R_dist[i] ** 2 * solver.d_R
-
-    him_pot = (np.log(solver.Density) - him_pot * 4 * np.pi * solver.Density) * solver.Temperature
 
-    return {
+def calculate_all_thermodynamics(solver, sensitivities=None) -> Dict[str, Any]:
+    """Расчет всех термодинамических параметров.
+    При переданных sensitivities (см. solve_sensitivities) добавляются
+    сжимаемость, dP/dT и теплоемкость.
+    Давление и энергия - по g(r) (pressure_energy_from_g), поэтому функция
+    работает и для LiquidSolver, и для MixtureSolver(1). Химический потенциал
+    считается только для решателей с функцией w(r) (поля w и N)"""
+    g = _pair_h(solver) + 1
+    pressure, energy = pressure_energy_from_g(solver.R_dist, g, solver.potential_type,
+                                              solver.Temperature, solver.Density)
+    result = {
         'pressure': pressure,
         'energy': energy,
-        'chemical_potential': him_pot,
         'temperature': solver.Temperature,
         'density': solver.Density
     }
 
+    # Расчет химического потенциала
+    if hasattr(solver, 'w') and hasattr(solver, 'N'):
+        him_pot = 0.0
+        for i in range(solver.N):
+            omega = solver.w[i] - (solver.Density * solver.F2[i] / solver.Temperature)
+            mbr1 = -(1 / 6) * omega ** 2 if solver.closure == ClosureType.MS_MOD else 0.0
+            c2 = solver.h[i] - solver.w[i] - 0.5 * solver.h[i] * (solver.w[i] + mbr1)
+            him_pot += c2 * solver.R_dist[i] ** 2 * solver.d_R
+        result['chemical_potential'] = (np.log(solver.Density)
+                                        - him_pot * 4 * np.pi * solver.Density) * solver.Temperature
+    if sensitivities is not None:
+        result.update(derivative_properties(solver, sensitivities))
+    return result
+
 
 # Добавляем алиас для обратной совместимости
 calculate_thermodynamics = calculate_all_thermodynamics
\ No newline at end of file
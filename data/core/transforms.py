@@ -0,0 +1,79 @@
+import os
+from functools import lru_cache
+import numpy as np
+import scipy.fft
+
+try:
+    import pyfftw
+    import pyfftw.interfaces.scipy_fft
+except ImportError:
+    pyfftw = None
+
+
+# Число потоков для FFT (по умолчанию все ядра)
+WORKERS = os.cpu_count() or 1
+_backend = 'scipy'
+
+
+def set_backend(name='scipy', workers=None):
+    """Выбор бэкенда преобразований: 'scipy' (pocketfft) или 'pyfftw'"""
+    global _backend, WORKERS
+    if workers is not None:
+        WORKERS = workers
+    if name == 'pyfftw':
+        if pyfftw is None:
+            raise ImportError("pyfftw не установлен")
+        # Кэш планов FFTW между вызовами
+        pyfftw.interfaces.cache.enable()
+        scipy.fft.set_global_backend(pyfftw.interfaces.scipy_fft)
+    elif name == 'scipy':
+        scipy.fft.set_global_backend('scipy')
+    else:
+        raise ValueError(f"Неизвестный бэкенд преобразований: {name}")
+    _backend = name
+
+
+def get_backend():
+    return _backend
+
+
+def sine_transform(arr, dst_type=2):
+    """Дискретное синус-преобразование по последней оси (пакетно для стека массивов)"""
+    return scipy.fft.dst(arr, type=dst_type, axis=-1, workers=WORKERS)
+
+
+def inverse_sine_transform(arr, dst_type=2):
+    """Обратное синус-преобразование по последней оси, нормированное (1/2N для типа 2)"""
+    return scipy.fft.idst(arr, type=dst_type, axis=-1, workers=WORKERS)
+
+
+@lru_cache(maxsize=32)
+def radial_grid(Nd, d_R, dtype=np.float64):
+    """Кэшируемые сетки r, k и нормировочные векторы для радиального преобразования
+    (по одному набору на (Nd, d_R, точность))"""
+    r = np.arange(1, Nd + 1) * d_R
+    d_K = np.pi / ((Nd + 1) * d_R)
+    k = np.arange(1, Nd + 1) * d_K
+    forward = 2 * np.pi * d_R / k
+    inverse = d_K / (4 * np.pi ** 2 * r)
+    arrays = tuple(a.astype(dtype) for a in (r, k, forward, inverse))
+    for a in arrays:
+        a.setflags(write=False)
+    r, k, forward, inverse = arrays
+    return r, k, d_K, forward, inverse
+
+
+def radial_transform(f, d_R):
+    """3D преобразование Фурье радиальных функций f(r) -> F(k) (DST-I).
+
+    Принимает массив (..., Nd): несколько функций или точек состояния
+    преобразуются одним вызовом.
+    """
+    r, k, d_K, forward, inverse = radial_grid(f.shape[-1], d_R, f.dtype)
+    return forward * sine_transform(f * r, dst_type=1)
+
+
+def inverse_radial_transform(F, d_R):
+    """Обратное 3D преобразование Фурье F(k) -> f(r) (DST-I)"""
+    r, k, d_K, forward, inverse = radial_grid(F.shape[-1], d_R, F.dtype)
+    return inverse * sine_transform(F * k, dst_type=1)
@@ -0,0 +1,3 @@
+from .renderer import FrameRenderer, render_report
+
+__all__ = ['FrameRenderer', 'render_report']
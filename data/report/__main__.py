@@ -0,0 +1,3 @@
+from .renderer import main
+
+main()
@@ -0,0 +1,208 @@
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+import numpy as np
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from core.result_store import ResultStore
+from core.decimation import minmax_decimate
+
+
+class FrameRenderer:
+    """Фигура g(r)/h(r), создаваемая один раз и переиспользуемая для всех кадров.
+
+    Между кадрами меняются только данные линий и заголовок; пределы осей
+    общие для всей развёртки, поэтому пересчёт масштаба не нужен.
+    """
+
+    def __init__(self, limits, dpi=100, size=(6.4, 6.4)):
+        self.dpi = dpi
+        self.figure = Figure(figsize=size, dpi=dpi)
+        self.canvas = FigureCanvasAgg(self.figure)
+        self.ax_g, self.ax_h = self.figure.subplots(2, 1, sharex=True)
+        self.line_g, = self.ax_g.plot([], [], 'b-', label='g(r)')
+        self.line_h, = self.ax_h.plot([], [], 'r-', label='h(r)')
+        self.title = self.figure.suptitle('')
+
+        (r_min, r_max), (g_min, g_max), (h_min, h_max) = limits
+        self.r_range = (r_min, r_max)
+        for ax, line, (low, high), label in ((self.ax_g, self.line_g, (g_min, g_max), 'g(r)'),
+                                            (self.ax_h, self.line_h, (h_min, h_max), 'h(r)')):
+            margin = 0.05 * (high - low) or 0.5
+            ax.set_xlim(r_min, r_max)
+            ax.set_ylim(low - margin, high + margin)
+            ax.set_ylabel(label)
+            ax.grid(True)
+            ax.legend(loc='upper right')
+        self.ax_h.set_xlabel('r')
+        # Место под заголовок кадра
+        self.figure.tight_layout(rect=(0, 0, 1, 0.95))
+        # Число бинов прореживания - ширина области осей в пикселях
+        self.n_bins = max(int(self.ax_g.get_window_extent().width), 1)
+
+    def render(self, r, g, h, title, path):
+        """Отрисовка одного кадра в файл"""
+        r = np.ascontiguousarray(r, dtype=np.float64)
+        self.line_g.set_data(*minmax_decimate(r, np.ascontiguousarray(g, dtype=np.float64),
+                                              *self.r_range, self.n_bins))
+        self.line_h.set_data(*minmax_decimate(r, np.ascontiguousarray(h, dtype=np.float64),
+                                              *self.r_range, self.n_bins))
+        self.title.set_text(title)
+        self.figure.savefig(path, dpi=self.dpi)
+
+
+def frame_limits(store):
+    """Общие пределы осей (r, g, h) для всех кадров хранилища"""
+    meta = store.meta[:store.count]
+    g_min = h_min = np.inf
+    for i in range(store.count):
+        r, g, h = store.frame(i)
+        g_min = min(g_min, np.nanmin(g))
+        h_min = min(h_min, np.nanmin(h))
+    return (store.r_range(),
+            (float(g_min), float(np.nanmax(meta['g_max']))),
+            (float(h_min), float(np.nanmax(meta['h_max']))))
+
+
+def compressibility_factor(store):
+    """S(k=0) = 1 + 4 pi rho int r^2 h(r) dr для каждого кадра"""
+    s0 = np.empty(store.count)
+    for i in range(store.count):
+        r, g, h = store.frame(i)
+        f = r ** 2 * h
+        s0[i] = 1 + 4 * np.pi * store.meta['density'][i] * np.sum(0.5 * (f[1:] + f[:-1]) * np.diff(r))
+    return s0
+
+
+# Состояние рабочего процесса: хранилище и фигура открываются один раз
+_store = None
+_renderer = None
+
+
+def _init_worker(store_path, limits, dpi):
+    global _store, _renderer
+    _store = ResultStore.open(store_path)
+    _renderer = FrameRenderer(limits, dpi)
+
+
+def _frame_path(out_dir, i, fmt):
+    return str(Path(out_dir) / f'frame_{i:05d}.{fmt}')
+
+
+def _render_frames(indices, out_dir, fmt):
+    """Отрисовка группы кадров в рабочем процессе; данные читаются из memmap"""
+    paths = []
+    for i in indices:
+        r, g, h = _store.frame(i)
+        meta = _store.meta[i]
+        title = (f"T = {meta['temperature']:.3f}, ρ = {meta['density']:.4f}, "
+                 f"итераций: {meta['iteration']}")
+        path = _frame_path(out_dir, i, fmt)
+        _renderer.render(r, g, h, title, path)
+        paths.append(path)
+    return paths
+
+
+def _render_summary(out_dir, fmt, dpi):
+    """Сводные фигуры: тепловые карты g(r, ρ), h(r, ρ) и кривые по плотности"""
+    store = _store
+    densities = store.densities()
+    meta = store.meta[:store.count]
+    rho_min, rho_max = densities.min(), densities.max()
+    if rho_max == rho_min:
+        rho_min, rho_max = rho_min - 0.5, rho_max + 0.5
+    paths = []
+
+    figure = Figure(figsize=(10, 4.5), dpi=dpi)
+    FigureCanvasAgg(figure)
+    axes = figure.subplots(1, 2)
+    for ax, key in zip(axes, ('g', 'h')):
+        image, (r_min, r_max) = store.heatmap(key)
+        mesh = ax.imshow(image, aspect='auto', origin='lower', interpolation='nearest',
+                         extent=(r_min, r_max, rho_min, rho_max))
+        figure.colorbar(mesh, ax=ax, label=f'{key}(r)')
+        ax.set_xlabel('r')
+        ax.set_ylabel('ρ')
+        ax.set_title(f'{key}(r, ρ)')
+    figure.tight_layout()
+    paths.append(str(Path(out_dir) / f'summary_heatmap.{fmt}'))
+    figure.savefig(paths[-1], dpi=dpi)
+
+    figure = Figure(figsize=(10, 7), dpi=dpi)
+    FigureCanvasAgg(figure)
+    axes = figure.subplots(2, 2, sharex=True).ravel()
+    curves = (
+        (meta['g_max'], 'g(max)'),
+        (meta['h_max'], 'h(max)'),
+        (compressibility_factor(store), 'S(0)'),
+        (meta['iteration'], 'Итерации'),
+    )
+    for ax, (values, label) in zip(axes, curves):
+        ax.plot(densities, values, 'o-', markersize=3)
+        ax.set_ylabel(label)
+        ax.grid(True)
+    for ax in axes[2:]:
+        ax.set_xlabel('ρ')
+    figure.suptitle(f"T = {meta['temperature'][0]:.3f}")
+    figure.tight_layout()
+    paths.append(str(Path(out_dir) / f'summary_curves.{fmt}'))
+    figure.savefig(paths[-1], dpi=dpi)
+    return paths
+
+
+def render_report(store_path, out_dir, workers=None, fmt='png', dpi=100,
+                  chunk_size=None, frames=True, on_progress=None):
+    """Пакетная отрисовка отчёта по сохранённой развёртке.
+
+    Кадры делятся на группы и рисуются в пуле процессов; каждый процесс
+    один раз открывает хранилище и создаёт фигуру, а затем только
+    обновляет данные линий. Сводные фигуры рисуются параллельно с кадрами.
+    Возвращает список созданных файлов.
+    """
+    store = ResultStore.open(store_path)
+    if store.count == 0:
+        raise ValueError(f"Хранилище {store_path} не содержит кадров")
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    workers = workers or os.cpu_count() or 1
+    indices = list(range(store.count)) if frames else []
+    chunk_size = chunk_size or max(1, -(-len(indices) // (4 * workers)))
+    chunks = [indices[i:i + chunk_size] for i in range(0, len(indices), chunk_size)]
+    limits = frame_limits(store)
+
+    paths = []
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                             initializer=_init_worker,
+                             initargs=(str(store_path), limits, dpi)) as executor:
+        futures = [executor.submit(_render_summary, str(out_dir), fmt, dpi)]
+        futures += [executor.submit(_render_frames, chunk, str(out_dir), fmt) for chunk in chunks]
+        for done, future in enumerate(as_completed(futures), 1):
+            paths.extend(future.result())
+            if on_progress:
+                on_progress(int(done / len(futures) * 100))
+    return sorted(paths)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Пакетная отрисовка отчёта по сохранённой развёртке")
+    parser.add_argument('store', help="Каталог ResultStore")
+    parser.add_argument('--output', default='report')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--format', default='png')
+    parser.add_argument('--dpi', type=int, default=100)
+    parser.add_argument('--summary-only', action='store_true')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    paths = render_report(args.store, args.output, args.workers, args.format, args.dpi,
+                          frames=not args.summary_only)
+    print(f"{len(paths)} файлов в {args.output} за {time.perf_counter() - start:.1f} с")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 from .main_window import MainWindow
 from .plotter import Plotter
 from .res_plotter import ResultsPlotter
+from .history import HistoryWidget
 from .dialogs import SettingsDialog, AboutDialog
 
-__all__ = ['MainWindow', 'Plotter', 'ResultsPlotter', 'SettingsDialog', 'AboutDialog']
\ No newline at end of file
+__all__ = ['MainWindow', 'Plotter', 'ResultsPlotter', 'HistoryWidget', 'SettingsDialog', 'AboutDialog']
\ No newline at end of file
@@ -0,0 +1,218 @@
+import numpy as np
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QCheckBox, QSlider, QLabel
+from PyQt5.QtCore import Qt, QTimer
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+from core.decimation import minmax_decimate, rasterize_curve
+
+
+class HistoryWidget(QWidget):
+    """Просмотр всех рассчитанных g(r)/h(r) развёртки: наложение кривых,
+    прокрутка по точкам и тепловая карта (rho, r)"""
+
+    def __init__(self):
+        super().__init__()
+        self.store = None
+        self._reset_cache()
+        # Фон без текущей кривой и маркера для быстрой перерисовки при прокрутке
+        self.background = None
+
+        # Новые кадры накапливаются и перерисовываются не чаще раза в интервал
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(500)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+        self.figure = Figure(figsize=(8, 6), dpi=100)
+        self.canvas = FigureCanvas(self.figure)
+        self.ax_curve = self.figure.add_subplot(211)
+        self.ax_map = self.figure.add_subplot(212)
+
+        self.ax_curve.set_xlabel("Distance r")
+        self.ax_curve.grid(True)
+        self.ax_map.set_xlabel("Distance r")
+        self.ax_map.set_ylabel("ρ")
+
+        # Наложение кривых - растр, в который дорисовываются только новые кадры
+        self.overlay = None
+        self.line_current, = self.ax_curve.plot([], [], 'b-', animated=True)
+        self.image = None
+        self.marker = self.ax_map.axhline(0, color='w', lw=0.8, animated=True)
+        self.canvas.mpl_connect('draw_event', self._on_draw)
+
+        self.key_combo = QComboBox()
+        self.key_combo.addItems(["g", "h"])
+        self.overlay_check = QCheckBox("Overlay")
+        self.overlay_check.setChecked(True)
+        self.slider = QSlider(Qt.Horizontal)
+        self.slider.setRange(0, 0)
+        self.label = QLabel()
+
+        controls = QHBoxLayout()
+        controls.addWidget(self.key_combo)
+        controls.addWidget(self.overlay_check)
+        controls.addWidget(self.slider, 1)
+        controls.addWidget(self.label)
+
+        layout = QVBoxLayout()
+        layout.addLayout(controls)
+        layout.addWidget(self.canvas)
+        self.setLayout(layout)
+
+        self.key_combo.currentTextChanged.connect(lambda _: self.rebuild())
+        self.overlay_check.toggled.connect(lambda _: self.rebuild())
+        self.slider.valueChanged.connect(self.show_frame)
+
+    def set_store(self, store):
+        self.store = store
+        self.rebuild()
+
+    def n_bins(self):
+        """Число бинов по r - ширина холста в пикселях"""
+        return max(self.canvas.width(), 100)
+
+    def _reset_cache(self):
+        """Сброс накопленных сегментов, строк тепловой карты и пределов"""
+        self.count = 0
+        self.segments = []
+        self.overlay_mask = None
+        self.overlay_limits = None
+        self.rasterized = 0
+        self.heatmap = None
+        self.heatmap_bins = 0
+        self.r_range = (0.0, 1.0)
+        self.y_range = (np.inf, -np.inf)
+
+    def _decimated(self, i, key):
+        r, g, h = self.store.frame(i)
+        y = g if key == 'g' else h
+        return minmax_decimate(np.asarray(r), np.asarray(y), self.r_range[0], self.r_range[1], self.n_bins())
+
+    def _on_draw(self, event):
+        """После полной перерисовки запоминается фон и поверх рисуются
+        анимируемые текущая кривая и маркер"""
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.ax_curve.draw_artist(self.line_current)
+        self.ax_map.draw_artist(self.marker)
+
+    def request_refresh(self):
+        """Отложенное обновление: кадры, пришедшие за интервал таймера,
+        добавляются одной перерисовкой"""
+        if not self.refresh_timer.isActive():
+            self.refresh_timer.start()
+
+    def rebuild(self):
+        """Полное перестроение (смена хранилища, величины, наложения или диапазона r)"""
+        self._reset_cache()
+        self.refresh()
+
+    def _append_frames(self, key):
+        """Добавление в кэш только кадров, пришедших после прошлого обновления"""
+        count = len(self.store)
+        if self.heatmap is None or len(self.heatmap) < self.store.capacity:
+            self.heatmap = np.full((self.store.capacity, self.heatmap_bins), np.nan)
+        values = self.store.g if key == 'g' else self.store.h
+        y_min, y_max = self.y_range
+        for i in range(self.count, count):
+            if self.overlay_check.isChecked():
+                self.segments.append(self._decimated(i, key))
+            self.heatmap[i] = self.store.heatmap_row(i, key, self.heatmap_bins, self.r_range)
+            n = self.store.meta['n'][i]
+            y_min = min(y_min, float(np.nanmin(values[i, :n])))
+            y_max = max(y_max, float(np.nanmax(values[i, :n])))
+        self.y_range = (y_min, y_max)
+        self.count = count
+
+    def _update_overlay(self, y_limits):
+        """Растеризация новых кривых в маску наложения размером с область осей.
+        Маска строится заново, только если изменились пределы или размер осей"""
+        bbox = self.ax_curve.get_window_extent()
+        shape = (max(int(bbox.height), 1), max(int(bbox.width), 1))
+        limits = (self.r_range, y_limits)
+        if self.overlay_mask is None or self.overlay_mask.shape != shape or self.overlay_limits != limits:
+            self.overlay_mask = np.zeros(shape, dtype=np.uint8)
+            self.overlay_limits = limits
+            self.rasterized = 0
+        for x, y in self.segments[self.rasterized:]:
+            rasterize_curve(x, y, self.r_range[0], self.r_range[1], y_limits[0], y_limits[1], self.overlay_mask)
+        self.rasterized = len(self.segments)
+
+        rgba = np.empty(shape + (4,))
+        rgba[..., :3] = 0.6
+        rgba[..., 3] = self.overlay_mask
+        extent = (self.r_range[0], self.r_range[1], y_limits[0], y_limits[1])
+        if self.overlay is None:
+            self.overlay = self.ax_curve.imshow(rgba, aspect='auto', origin='lower', extent=extent,
+                                                interpolation='nearest', zorder=1)
+        else:
+            self.overlay.set_data(rgba)
+            self.overlay.set_extent(extent)
+
+    def refresh(self):
+        """Добавление новых кадров в наложение и тепловую карту и перерисовка.
+        Обрабатываются только новые кадры; всё строится заново, лишь если
+        изменился диапазон r или число бинов"""
+        if self.store is None or len(self.store) == 0:
+            return
+        key = self.key_combo.currentText()
+        count = len(self.store)
+        r_range = self.store.r_range()
+        bins = min(self.n_bins(), self.store.max_points())
+        if r_range != self.r_range or bins != self.heatmap_bins:
+            self._reset_cache()
+            self.r_range = r_range
+            self.heatmap_bins = bins
+        self._append_frames(key)
+
+        y_min, y_max = self.y_range
+        margin = 0.05 * (y_max - y_min) or 0.5
+        y_limits = (y_min - margin, y_max + margin)
+        self._update_overlay(y_limits)
+        self.ax_curve.set_xlim(*self.r_range)
+        self.ax_curve.set_ylim(*y_limits)
+
+        image = self.heatmap[:count]
+        rho = self.store.densities()
+        extent = (self.r_range[0], self.r_range[1], rho[0], rho[-1] if len(rho) > 1 else rho[0] + 1e-3)
+        if self.image is None:
+            self.image = self.ax_map.imshow(image, aspect='auto', origin='lower',
+                                            extent=extent, interpolation='nearest')
+            self.figure.colorbar(self.image, ax=self.ax_map)
+        else:
+            self.image.set_data(image)
+            self.image.set_extent(extent)
+            self.image.autoscale()
+        self.ax_curve.set_ylabel(f"{key}(r)")
+
+        at_end = self.slider.value() == self.slider.maximum()
+        self.slider.blockSignals(True)
+        self.slider.setMaximum(count - 1)
+        if at_end:
+            self.slider.setValue(count - 1)
+        self.slider.blockSignals(False)
+        self._set_current(self.slider.value())
+
+        # Полная перерисовка; фон для прокрутки обновится в _on_draw
+        self.background = None
+        self.canvas.draw_idle()
+
+    def _set_current(self, i):
+        x, y = self._decimated(i, self.key_combo.currentText())
+        self.line_current.set_data(x, y)
+        rho = self.store.meta['density'][i]
+        self.marker.set_ydata([rho, rho])
+        self.label.setText(f"ρ = {rho:.3f}")
+
+    def show_frame(self, i):
+        """Прокрутка: поверх сохранённого фона перерисовываются только
+        текущая кривая и маркер"""
+        if self.store is None or i >= len(self.store):
+            return
+        self._set_current(i)
+        if self.background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self.background)
+        self.ax_curve.draw_artist(self.line_current)
+        self.ax_map.draw_artist(self.marker)
+        self.canvas.blit(self.figure.bbox)
@@ -1,18 +1,25 @@
 import sys
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
 import numpy as np
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QTabWidget, QStatusBar, QGroupBox,
     QFormLayout, QDoubleSpinBox, QSpinBox, QComboBox,
     QTableWidget, QTableWidgetItem, QHeaderView,
-    QProgressBar, QMessageBox
+    QProgressBar, QMessageBox, QCheckBox, QLineEdit, QFileDialog
 )
-from PyQt5.QtCore import QThread, Qt
+from PyQt5.QtCore import Qt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 from core.solver import LiquidSolver
 from core.constants import ClosureType, SolutionMethod, PotentialType, EquationType
-from .worker import Worker
+from core.result_store import ResultStore
+from core.sweep import density_points
+from .worker import ProcessWorker
+from .history import HistoryWidget
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -55,6 +62,11 @@ class PlotterWidget(QWidget):
         self.ax2.autoscale_view()
         self.canvas.draw()
 
+    def freeze(self):
+        """Копирование данных линий, чтобы график не ссылался на разделяемую память"""
+        for line in (self.line_g, self.line_h):
+            line.set_data(np.array(line.get_xdata()), np.array(line.get_ydata()))
+
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -63,8 +75,10 @@ class MainWindow(QMainWindow):
         self.setGeometry(100, 100, 1400, 900)
 
         self.solver = LiquidSolver()
-        self.worker_thread = None
         self.worker = None
+        self.store = None
+        # Каталог временного хранилища (удаляется при следующем запуске и закрытии)
+        self._temporary_store = None
 
         self.init_ui()
         self.setup_connections()
@@ -115,6 +129,16 @@ class MainWindow(QMainWindow):
         self.Nd_spin.setValue(500)
         grid_layout.addRow("Grid Points (Nd):", self.Nd_spin)
 
+        self.auto_grid_check = QCheckBox()
+        grid_layout.addRow("Auto Grid:", self.auto_grid_check)
+
+        self.grid_tol_spin = QDoubleSpinBox()
+        self.grid_tol_spin.setDecimals(6)
+        self.grid_tol_spin.setRange(1e-6, 1e-1)
+        self.grid_tol_spin.setValue(1e-3)
+        self.grid_tol_spin.setEnabled(False)
+        grid_layout.addRow("Grid Tolerance:", self.grid_tol_spin)
+
         grid_group.setLayout(grid_layout)
         left_panel.addWidget(grid_group)
 
@@ -182,9 +206,33 @@ class MainWindow(QMainWindow):
         self.alpha_spin.setValue(1.0)
         conv_layout.addRow("Alpha (RY only):", self.alpha_spin)
 
+        self.threads_spin = QSpinBox()
+        self.threads_spin.setRange(1, 64)
+        self.threads_spin.setValue(1)
+        conv_layout.addRow("Threads:", self.threads_spin)
+
+        self.precision_combo = QComboBox()
+        self.precision_combo.addItems(["double", "mixed"])
+        conv_layout.addRow("Precision:", self.precision_combo)
+
         conv_group.setLayout(conv_layout)
         left_panel.addWidget(conv_group)
 
+        # Группа сохранения результатов
+        output_group = QGroupBox("Output")
+        output_layout = QHBoxLayout()
+
+        self.results_dir_edit = QLineEdit()
+        self.results_dir_edit.setPlaceholderText("temporary (deleted on exit)")
+        self.btn_results_dir = QPushButton("...")
+        self.btn_results_dir.setFixedWidth(30)
+
+        output_layout.addWidget(self.results_dir_edit)
+        output_layout.addWidget(self.btn_results_dir)
+
+        output_group.setLayout(output_layout)
+        left_panel.addWidget(output_group)
+
         # Группа управления
         control_group = QGroupBox("Control")
         control_layout = QVBoxLayout()
@@ -218,8 +266,11 @@ class MainWindow(QMainWindow):
         ])
         self.results_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
 
+        self.history = HistoryWidget()
+
         self.tabs.addTab(self.plotter, "Plots")
         self.tabs.addTab(self.results_table, "Results")
+        self.tabs.addTab(self.history, "History")
         right_panel.addWidget(self.tabs)
         main_layout.addLayout(right_panel, 2)
 
@@ -239,9 +290,45 @@ class MainWindow(QMainWindow):
         self.btn_start.clicked.connect(self.start_calculation)
         self.btn_stop.clicked.connect(self.stop_calculation)
         self.btn_reset.clicked.connect(self.reset_calculation)
+        self.auto_grid_check.toggled.connect(self.toggle_auto_grid)
+        self.btn_results_dir.clicked.connect(self.choose_results_dir)
+        self.tabs.currentChanged.connect(lambda _: self.refresh_history(immediate=True))
+
+    def toggle_auto_grid(self, checked):
+        self.L_spin.setEnabled(not checked)
+        self.Nd_spin.setEnabled(not checked)
+        self.grid_tol_spin.setEnabled(checked)
+
+    def choose_results_dir(self):
+        path = QFileDialog.getExistingDirectory(self, "Results Directory", self.results_dir_edit.text())
+        if path:
+            self.results_dir_edit.setText(path)
+
+    def create_store(self):
+        """Хранилище кадров развёртки: подкаталог выбранного каталога результатов
+        (сохраняется) или временный каталог (удаляется при следующем запуске)"""
+        n_points = self.solver.max_grid_points if self.solver.auto_grid else self.solver.Nd
+        results_dir = self.results_dir_edit.text().strip()
+        if results_dir:
+            path = Path(results_dir) / datetime.now().strftime('sweep_%Y%m%d_%H%M%S')
+            temporary = None
+        else:
+            path = temporary = Path(tempfile.mkdtemp(prefix='sweep_'))
+        store = ResultStore.create(path, len(density_points(self.solver)), n_points)
+
+        self.history.set_store(store)
+        self.remove_temporary_store()
+        self.store = store
+        self._temporary_store = temporary
+        logger.info("Кадры развёртки сохраняются в %s", path)
+
+    def remove_temporary_store(self):
+        if self._temporary_store is not None:
+            shutil.rmtree(self._temporary_store, ignore_errors=True)
+            self._temporary_store = None
 
     def start_calculation(self):
-        if self.worker_thread and self.worker_thread.isRunning():
+        if self.worker and self.worker.is_running():
             return
 
         try:
@@ -254,6 +341,8 @@ class MainWindow(QMainWindow):
             self.solver.L = self.L_spin.value()
             self.solver.Nd = self.Nd_spin.value()
             self.solver.At = self.solver.L / self.solver.Nd
+            self.solver.auto_grid = self.auto_grid_check.isChecked()
+            self.solver.grid_tolerance = self.grid_tol_spin.value()
 
             self.solver.T0 = self.T0_spin.value()
             self.solver.Tk = self.Tk_spin.value()
@@ -266,34 +355,34 @@ class MainWindow(QMainWindow):
             self.solver.convergence_dg = self.conv_spin.value()
             self.solver.max_iterations = self.max_iter_spin.value()
             self.solver.alpha = self.alpha_spin.value()
+            self.solver.n_threads = self.threads_spin.value()
+            self.solver.precision = self.precision_combo.currentText()
 
             self.solver.Temperature = self.solver.T0
             self.solver.Density = self.solver.rho0
             self.solver._initialize_arrays()
 
-            # Настраиваем worker и поток
-            self.worker_thread = QThread()
-            self.worker = Worker(self.solver)
-            self.worker.moveToThread(self.worker_thread)
+            # Хранилище кадров развёртки для просмотра истории и отчётов
+            self.create_store()
+
+            # Решатель работает в отдельном процессе
+            self.release_worker()
+            self.worker = ProcessWorker(self.solver)
 
             # Подключаем сигналы
-            self.worker_thread.started.connect(self.worker.run)
             self.worker.progress.connect(self.progress_bar.setValue)
             self.worker.result.connect(self.update_results)
             self.worker.error.connect(self.show_error)
-            self.worker.finished.connect(self.worker_thread.quit)
-            self.worker.finished.connect(self.worker.deleteLater)
-            self.worker_thread.finished.connect(self.worker_thread.deleteLater)
-            self.worker_thread.finished.connect(self.calculation_finished)
+            self.worker.finished.connect(self.calculation_finished)
 
             # Обновляем UI
             self.btn_start.setEnabled(False)
             self.btn_stop.setEnabled(True)
             self.progress_bar.show()
-            self.statusBar().showMessage("Calculation started...")
+            self.statusBar().showMessage(f"Calculation started... results: {self.store.path}")
 
-            # Запускаем поток
-            self.worker_thread.start()
+            # Запускаем процесс
+            self.worker.start()
 
         except Exception as e:
             self.show_error(str(e))
@@ -301,6 +390,8 @@ class MainWindow(QMainWindow):
     def update_results(self, data):
         # Обновляем графики
         self.plotter.update_plot(data['r'], data['g'], data['h'])
+        self.store.append(data, self.solver.Temperature)
+        self.refresh_history()
 
         # Обновляем таблицу результатов
         row = self.results_table.rowCount()
@@ -322,17 +413,31 @@ class MainWindow(QMainWindow):
 
         self.results_table.scrollToBottom()
 
+    def refresh_history(self, immediate=False):
+        """История перерисовывается, только когда вкладка открыта;
+        новые кадры развёртки добавляются пачками по таймеру"""
+        if self.tabs.currentWidget() is self.history:
+            if immediate:
+                self.history.refresh()
+            else:
+                self.history.request_refresh()
+
     def stop_calculation(self):
         if self.worker:
             self.worker.stop()
         self.statusBar().showMessage("Calculation stopped")
 
+    def release_worker(self):
+        """Завершение процесса решателя и освобождение разделяемой памяти"""
+        if self.worker:
+            self.plotter.freeze()
+            self.worker.close()
+            self.worker.deleteLater()
+            self.worker = None
+
     def reset_calculation(self):
         self.stop_calculation()
-
-        if self.worker_thread and self.worker_thread.isRunning():
-            self.worker_thread.quit()
-            self.worker_thread.wait()
+        self.release_worker()
 
         self.solver = LiquidSolver()
         self.plotter.update_plot(self.solver.R_dist, self.solver.g, self.solver.h)
@@ -343,7 +448,10 @@ class MainWindow(QMainWindow):
         self.btn_start.setEnabled(True)
         self.btn_stop.setEnabled(False)
         self.progress_bar.hide()
-        self.statusBar().showMessage("Calculation finished")
+        if self.store is not None:
+            self.statusBar().showMessage(f"Calculation finished, results: {self.store.path}")
+        else:
+            self.statusBar().showMessage("Calculation finished")
 
     def show_error(self, message):
         QMessageBox.critical(self, "Error", message)
@@ -351,7 +459,8 @@ class MainWindow(QMainWindow):
 
     def closeEvent(self, event):
         self.stop_calculation()
-        if self.worker_thread and self.worker_thread.isRunning():
-            self.worker_thread.quit()
-            self.worker_thread.wait()
+        self.release_worker()
+        self.history.set_store(None)
+        self.store = None
+        self.remove_temporary_store()
         event.accept()
\ No newline at end of file
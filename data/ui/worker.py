@@ -1,62 +1,63 @@
-from PyQt5.QtCore import QObject, pyqtSignal
-import numpy as np
-from numba import njit
-import time
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from core.process_backend import SolverProcess
 
 
-class Worker(QObject):
+class ProcessWorker(QObject):
+    """Решатель в отдельном процессе: GUI только опрашивает уведомления
+    и читает кадры из разделяемой памяти без копирования"""
     progress = pyqtSignal(int)
     result = pyqtSignal(dict)
     finished = pyqtSignal()
     error = pyqtSignal(str)
 
-    def __init__(self, solver):
+    def __init__(self, solver, poll_interval=30):
         super().__init__()
-        self.solver = solver
-        self._is_running = False
-
-    def run(self):
-        try:
-            self._is_running = True
-
-            rho0 = self.solver.rho0
-            rhok = self.solver.rhok
-            drho = self.solver.drho
-
-            for rho in np.arange(rho0, rhok + drho, drho):
-                if not self._is_running:
-                    break
-
-                self.solver.Density = rho
-                self.solver._initialize_arrays()
-
-                for iteration in range(self.solver.max_iterations):
-                    if not self._is_running:
-                        break
-
-                    self.solver.make_iteration()
-                    dg = np.max(np.abs(self.solver.g - self.solver.g_prev)) / np.mean(np.abs(self.solver.g))
-
-                    progress = int((rho - rho0) / (rhok - rho0) * 100)
-                    self.progress.emit(progress)
-
-                    if dg < self.solver.convergence_dg:
-                        break
-
-                # Добавляем расчет h(r) = g(r) - 1
-                h_r = self.solver.g - 1
-
-                self.result.emit({
-                    'r': self.solver.R_dist,
-                    'g': self.solver.g,
-                    'h': h_r,  # Теперь передаем h(r)
-                    'ρ': rho,
-                    'iteration': iteration + 1,
-                    'h_max': np.max(h_r),  # Максимальное значение h(r)
-                    'g_max': np.max(self.solver.g)  # Максимальное значение g(r)
-                })
-
-        except Exception as e:
-            self.error.emit(str(e))
-        finally:
-            self.finished.emit()
\ No newline at end of file
+        self.backend = SolverProcess(solver)
+        self._shown_slot = None
+        self.timer = QTimer(self)
+        self.timer.setInterval(poll_interval)
+        self.timer.timeout.connect(self.poll)
+
+    def start(self):
+        self.backend.start()
+        self.timer.start()
+
+    def poll(self):
+        # Состояние процесса проверяется до чтения очереди: всё, что умерший
+        # процесс успел отправить, к этому моменту уже лежит в очереди
+        alive = self.backend.is_alive()
+        for message in self.backend.poll():
+            kind = message[0]
+            if kind == 'progress':
+                self.progress.emit(message[1])
+            elif kind == 'frame':
+                _, slot, n, meta = message
+                r, g, h = self.backend.frame(slot, n)
+                self.result.emit(dict(meta, r=r, g=g, h=h))
+                # Предыдущий кадр больше не отображается - возвращаем слот
+                if self._shown_slot is not None:
+                    self.backend.release()
+                self._shown_slot = slot
+            elif kind == 'error':
+                self.error.emit(message[1])
+            elif kind == 'finished':
+                self.timer.stop()
+                self.finished.emit()
+
+        if not alive and self.timer.isActive():
+            # Процесс завершился без уведомления 'finished' (убит, сбой, ошибка запуска)
+            self.timer.stop()
+            self.error.emit(f"Процесс решателя неожиданно завершился (код {self.backend.exitcode})")
+            self.finished.emit()
+
+    def is_running(self):
+        return self.timer.isActive()
+
+    def stop(self):
+        self.backend.stop()
+
+    def close(self):
+        """Остановка процесса и освобождение разделяемой памяти.
+        Перед вызовом представления кадров не должны использоваться"""
+        self.timer.stop()
+        self.backend.close()